@@ -0,0 +1,257 @@
+""" This script times the table at different numbers of rows, so that
+the results of a change can be compared with those before it
+
+The table is made on a withdrawn root window, so the script runs on a
+machine without a screen as long as there is an X server, e.g Xvfb.
+Each case runs in a process of its own, so that the peak memory of
+one case is not carried into the next
+
+Timed:
+------
+:init - making the Table
+:first_screen - placing the rows, until the rows in view are shown
+:add_rows - placing the rows, until all of them are bound, which the
+    table does a few at a time after the first screen when it is not
+    virtualized
+:scroll - turns of the Mouse Wheel, each until the table is idle
+:click - clicking rows in view, which selects them
+:delete - deleting the selected row, the confirmation answered yes
+
+Counted:
+--------
+:widgets - all the widgets of the window after the rows are placed
+:canvas_items - the items on the canvas of the table
+:peak_rss_kb - the peak memory of the process of the case
+
+Procedure:
+----------
+:- Run 'python benchmarks/bench_table.py' from the root of the project,
+or under Xvfb with 'xvfb-run python benchmarks/bench_table.py'
+:- Pass '--sizes 1000 10000' to choose the numbers of rows, and
+'--output results.json' for the file the results are written to
+:- Compare the files of two runs to find the changes
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from paphra_tktable import table as tktable
+
+_KEYS = ['name', 'status', 'note', 'qty', 'unit', 'comment']
+_TITLES = [{'text': 'Name', 'width': 15, 'type': 'l'},
+           {'text': 'Status', 'width': 10, 'type': 'c'},
+           {'text': 'Note', 'width': 15, 'type': 'e'},
+           {'text': 'Qty', 'width': 6, 'type': 'l'},
+           {'text': 'Unit', 'width': 6, 'type': 'c'},
+           {'text': 'Comment', 'width': 20, 'type': 'e'}]
+_CONFIGS = [('widgets', False), ('widgets', True), ('canvas', True)]
+
+
+def make_rows(count):
+    """ Makes rows of the mixed types of columns
+    :type count: int
+    :param count: number of the rows
+    :return: list - of rows[dictionaries]
+    """
+    return [{'name': 'item ' + str(_i),
+             'status': ('open', 'closed', 'held')[_i % 3],
+             'note': 'note of row ' + str(_i),
+             'qty': _i % 97,
+             'unit': ('kg', 'pcs', 'l')[_i % 3],
+             'comment': 'comment ' + str(_i * 7)} for _i in range(count)]
+
+
+def _spread(times):
+    """ The mean and the largest of some timings, in milliseconds
+    :type times: list
+    :param times: list of timings in seconds
+    :return: dict
+    """
+    if not times:
+        return {'count': 0, 'mean_ms': None, 'max_ms': None}
+    return {'count': len(times),
+            'mean_ms': round(sum(times) * 1000 / len(times), 3),
+            'max_ms': round(max(times) * 1000, 3)}
+
+
+def _count_widgets(widget):
+    """ The number of widgets under a widget, itself included """
+    return 1 + sum(_count_widgets(child)
+                   for child in widget.winfo_children())
+
+
+def _settle(root, table):
+    """ Runs the table until it is idle, the scroll of the wheel
+    included
+    :return: None
+    """
+    if table._wheel_job is not None:
+        table.list_canvas.after_cancel(table._wheel_job)
+        table._apply_wheel()
+    root.update_idletasks()
+
+
+def _wheel(root, table, delta):
+    """ Turns the wheel over the canvas of the table, through the
+    bindings of the table
+    :type delta: int
+    :param delta: the delta of the wheel, negative to scroll down
+    :return: None
+    """
+    if root.tk.call('tk', 'windowingsystem') == 'x11':
+        button = 5 if delta < 0 else 4
+        for _n in range(max(1, abs(delta) // 120)):
+            table.list_canvas.event_generate('<Button-%d>' % button)
+    else:
+        table.list_canvas.event_generate('<MouseWheel>', delta=delta)
+
+
+def _click(table, pos):
+    """ Clicks the row at a position of the table
+    :type pos: int
+    :param pos: position of the row on the table
+    :return: None
+    """
+    slot = table._slots[pos]
+    if table.renderer == 'canvas':
+        _y = (pos * tktable._ROW_HEIGHT) - table.list_canvas.canvasy(0)
+        table._canvas_click(argparse.Namespace(x=5, y=_y + 2))
+    else:
+        table._click(argparse.Namespace(widget=slot.widgets[1]))
+
+
+def run_case(count, renderer, virtual, repeat):
+    """ Times the table with a number of rows
+    :type count: int
+    :param count: number of the rows
+    :type renderer: str
+    :param renderer: the renderer of the table
+    :type virtual: bool
+    :param virtual: whether the table is virtualized
+    :type repeat: int
+    :param repeat: number of the scrolls, clicks and deletions timed
+    :return: dict - of the results
+    """
+    tktable.msg.askquestion = lambda *args, **kwargs: 'yes'
+    root = tk.Tk()
+    root.withdraw()
+    frame = tk.Frame(root)
+    frame.grid()
+    rows = make_rows(count)
+    result = {'rows': count, 'renderer': renderer, 'virtual': virtual}
+
+    start = time.perf_counter()
+    table = tktable.Table(frame, list(_KEYS), [dict(t) for t in _TITLES],
+                          width=600, height=400, virtual=virtual,
+                          renderer=renderer)
+    root.update_idletasks()
+    result['init_s'] = round(time.perf_counter() - start, 6)
+
+    start = time.perf_counter()
+    table.add_rows(rows)
+    root.update_idletasks()
+    result['first_screen_s'] = round(time.perf_counter() - start, 6)
+    while table._fill_job is not None:
+        root.update()
+    result['add_rows_s'] = round(time.perf_counter() - start, 6)
+    result['widgets'] = _count_widgets(root)
+    result['canvas_items'] = len(table.list_canvas.find_all())
+
+    times = []
+    for _n in range(repeat):
+        start = time.perf_counter()
+        _wheel(root, table, -120 if _n < repeat // 2 else 120 * 3)
+        _settle(root, table)
+        times.append(time.perf_counter() - start)
+    result['scroll'] = _spread(times)
+
+    table.list_canvas.yview_moveto(0.5)
+    root.update_idletasks()
+    shown = sorted(table._slots)
+    times = []
+    for _n in range(repeat):
+        pos = shown[(_n * 3) % len(shown)]
+        start = time.perf_counter()
+        _click(table, pos)
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    result['click'] = _spread(times)
+
+    times = []
+    for _n in range(min(repeat, count - 1)):
+        if table.get_selected() is None:
+            _click(table, sorted(table._slots)[0])
+        start = time.perf_counter()
+        table.delete_row()
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    result['delete'] = _spread(times)
+
+    result['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    root.destroy()
+    return result
+
+
+def main():
+    """ Runs the cases, each in a process of its own, and writes the
+    results
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description='Times the table')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000],
+                        help='numbers of rows timed')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='number of scrolls, clicks and deletions')
+    parser.add_argument('--plain-limit', type=int, default=10000,
+                        help='rows above which the table which is not '
+                             'virtualized is not timed, 0 for no limit')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='file the results are written to')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case is not None:
+        count, renderer, virtual = json.loads(args.case)
+        print(json.dumps(run_case(count, renderer, virtual, args.repeat)))
+        return
+
+    results = []
+    for count in args.sizes:
+        for renderer, virtual in _CONFIGS:
+            if not virtual and 0 < args.plain_limit < count:
+                continue
+            case = json.dumps([count, renderer, virtual])
+            done = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--case', case,
+                 '--repeat', str(args.repeat)],
+                stdout=subprocess.PIPE, universal_newlines=True)
+            if done.returncode != 0:
+                results.append({'rows': count, 'renderer': renderer,
+                                'virtual': virtual, 'failed': True})
+                continue
+            results.append(json.loads(done.stdout.strip().splitlines()[-1]))
+            print('{rows:>7} {renderer:>8} virtual={virtual!s:<5} '
+                  'add_rows={add_rows_s:.3f}s widgets={widgets} '
+                  'rss={peak_rss_kb}kB'.format(**results[-1]))
+
+    with open(args.output, 'w') as file:
+        json.dump({'python': platform.python_version(),
+                   'tk': str(tk.TkVersion),
+                   'platform': platform.platform(),
+                   'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'results': results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+""" This module writes rows out to CSV and JSON Lines files. The lines
+are made by generators taking one row at a time, so the rows are never
+all held as text at once
+
+Functions:
+----------
+:csv_lines - The lines of CSV text of some rows
+:jsonl_lines - The lines of JSON Lines text of some rows
+:write_lines - Writes lines to a file, telling of the progress
+:export_format - The format of a file from its extension
+"""
+
+import csv
+import io
+import json
+
+_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+_PROGRESS_EVERY = 1000                  # rows written between progress
+
+
+def csv_lines(rows, _keys_, header=None, **fmtparams):
+    """ The lines of CSV text of some rows
+    :type rows: iterable
+    :param rows: the rows[dictionaries]
+    :type _keys_: list
+    :param _keys_: list of strings for the keys written, in order
+    :type header: list
+    :param header: the texts of the first line. No first line is
+        written if it is None
+    :param fmtparams: the format of the text, as for 'csv.writer'
+    :return: generator - of the lines
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, **fmtparams)
+    if header is not None:
+        writer.writerow(header)
+        yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([row[key] for key in _keys_])
+        yield buffer.getvalue()
+
+
+def jsonl_lines(rows, _keys_):
+    """ The lines of JSON Lines text of some rows. Values which are not
+    of JSON are written as their text
+    :type rows: iterable
+    :param rows: the rows[dictionaries]
+    :type _keys_: list
+    :param _keys_: list of strings for the keys written, in order
+    :return: generator - of the lines
+    """
+    for row in rows:
+        yield json.dumps({key: row[key] for key in _keys_},
+                         default=str) + '\n'
+
+
+def write_lines(lines, path, on_progress=None, encoding='utf-8'):
+    """ Writes lines to a file
+    :type lines: iterable
+    :param lines: the lines, e.g from 'csv_lines'
+    :type path: str
+    :param path: path of the file
+    :type on_progress: callable
+    :param on_progress: called with the number of the lines written
+        after every thousand lines
+    :type encoding: str
+    :param encoding: encoding of the file
+    :return: int - number of the lines written
+    """
+    count = 0
+    with open(path, 'w', encoding=encoding, newline='') as file:
+        for line in lines:
+            file.write(line)
+            count = count + 1
+            if on_progress is not None and count % _PROGRESS_EVERY == 0:
+                on_progress(count)
+    return count
+
+
+def export_format(path):
+    """ The format of a file from the extension of its path
+    :type path: str
+    :param path: path of the file
+    :return: str - 'csv' or 'jsonl'
+    """
+    for extension, fmt in _FORMATS.items():
+        if path.lower().endswith(extension):
+            return fmt
+    raise ValueError('the format of {!r} is not known; pass '
+                     "fmt='csv' or fmt='jsonl'".format(path))
@@ -0,0 +1,225 @@
+""" This module reads rows from CSV and JSON Lines files and from sqlite3
+queries for a table, one row at a time, and works out the columns of
+the rows when the table is not given them
+
+Functions:
+----------
+:csv_records - The keys and the rows of a CSV file
+:jsonl_records - The keys and the rows of a JSON Lines file
+:sqlite_records - The keys and the rows of a query of a database
+:infer_columns - The titles of the columns, and the types of the
+    values, from some of the rows
+:typed_rows - The rows with their values made of the types worked out
+
+Note:
+-----
+The rows are read as they are asked for, so a file is only read as
+fast as the table takes in the rows, and is closed when all are read
+"""
+
+import csv
+import io
+import itertools
+import json
+import mmap
+import sqlite3
+
+_SAMPLE = 200                           # rows the columns are inferred from
+_MIN_WIDTH = 4
+_MAX_WIDTH = 40
+
+
+def _lines(path, use_mmap, encoding):
+    """ The lines of text of a file, from a memory map of it if asked
+    :type path: str
+    :param path: path of the file
+    :type use_mmap: bool
+    :param use_mmap: whether the file is read through a memory map
+    :type encoding: str
+    :param encoding: encoding of the file
+    :return: generator - of the lines
+    """
+    with open(path, 'rb') as file:
+        if use_mmap:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:          # an empty file cannot be mapped
+                return
+            with data:
+                for line in iter(data.readline, b''):
+                    yield line.decode(encoding)
+        else:
+            for line in io.TextIOWrapper(file, encoding=encoding,
+                                         newline=''):
+                yield line
+
+
+def csv_records(path, encoding='utf-8', use_mmap=False, **fmtparams):
+    """ The keys and the rows of a CSV file whose first row has the keys.
+    The values are left as text
+    :type path: str
+    :param path: path of the CSV file
+    :type encoding: str
+    :param encoding: encoding of the file
+    :type use_mmap: bool
+    :param use_mmap: whether the file is read through a memory map,
+        which is faster for large files
+    :param fmtparams: the format of the file, as for 'csv.reader'
+    :return: tuple - the list of the keys and a generator of the rows
+    """
+    reader = csv.reader(_lines(path, use_mmap, encoding), **fmtparams)
+    keys = next(reader, [])
+    rows = (dict(zip(keys, values + [''] * (len(keys) - len(values))))
+            for values in reader if values)
+    return keys, rows
+
+
+def jsonl_records(path, encoding='utf-8', use_mmap=False):
+    """ The keys and the rows of a JSON Lines file, each line having an
+    object. The keys are those of the first rows, in order, and the
+    rows are given all of them
+    :type path: str
+    :param path: path of the JSON Lines file
+    :type encoding: str
+    :param encoding: encoding of the file
+    :type use_mmap: bool
+    :param use_mmap: whether the file is read through a memory map
+    :return: tuple - the list of the keys and a generator of the rows
+    """
+    records = (json.loads(line) for line in _lines(path, use_mmap, encoding)
+               if line.strip())
+    sample = list(itertools.islice(records, _SAMPLE))
+    keys = []
+    for record in sample:
+        keys.extend(key for key in record if key not in keys)
+    rows = ({key: record.get(key) for key in keys}
+            for record in itertools.chain(sample, records))
+    return keys, rows
+
+
+def sqlite_records(conn, query, params=(), batch_size=500):
+    """ The keys and the rows of a query of a database. The keys are the
+    names of the columns of the query
+    :type conn: sqlite3.Connection or str
+    :param conn: the connection, or the path of the database file. A
+        connection opened from a path is closed when all the rows are
+        read, or when the generator of the rows is closed
+    :type query: str
+    :param query: the query
+    :type params: tuple or dict
+    :param params: the parameters of the query
+    :type batch_size: int
+    :param batch_size: number of rows fetched at a time
+    :return: tuple - the list of the keys and a generator of the rows
+    """
+    opened = isinstance(conn, str)
+    if opened:
+        conn = sqlite3.connect(conn)
+    try:
+        cur = conn.execute(query, params)
+    except Exception:
+        if opened:
+            conn.close()
+        raise
+    keys = [desc[0] for desc in cur.description]
+
+    def _rows():
+        try:
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    return
+                for values in batch:
+                    yield dict(zip(keys, values))
+        finally:
+            if opened:
+                conn.close()
+
+    return keys, _rows()
+
+
+def _type_of(values):
+    """ The type which all the texts of a column read as; int, float
+    or str. Empty texts are left out
+    :type values: list
+    :param values: the values of the column
+    :return: type or None - if the values are not all text or numbers
+    """
+    found = int
+    if all(value in ('', None) for value in values):
+        return str
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            if isinstance(value, bool) or not isinstance(value,
+                                                         (int, float)):
+                return None             # left as it is
+            if isinstance(value, float):
+                found = float
+            continue
+        if value == '':
+            continue
+        if found is int:
+            try:
+                int(value)
+                continue
+            except ValueError:
+                found = float
+        try:
+            float(value)
+        except ValueError:
+            return str
+    return found
+
+
+def infer_columns(keys, sample):
+    """ Works out the titles of the columns and the types of the values
+    from some of the rows. The titles are of type 'l', as wide as the
+    longest text in the rows, within some limits
+    :type keys: list
+    :param keys: list of strings for the keys of the rows
+    :type sample: list
+    :param sample: some of the rows
+    :return: tuple - the list of the titles and a dictionary of the
+        types of the values, by key
+    """
+    titles = []
+    types = {}
+    for key in keys:
+        values = [row.get(key) for row in sample]
+        types[key] = _type_of(values)
+        width = max([len(str(key))] + [len(str(value)) for value in values
+                                       if value is not None])
+        titles.append({'text': str(key), 'type': 'l',
+                       'width': max(_MIN_WIDTH, min(width, _MAX_WIDTH))})
+    return titles, types
+
+
+def _convert(value, kind):
+    """ A value of text made of a type, or left as it is if it does not
+    read as that type, e.g empty text
+    """
+    if not isinstance(value, str) or value == '':
+        return value
+    try:
+        return kind(value)
+    except ValueError:
+        return value
+
+
+def typed_rows(rows, types):
+    """ The rows with the values of the keys of type int or float made
+    of their types
+    :type rows: iterable
+    :param rows: the rows[dictionaries]
+    :type types: dict
+    :param types: the types of the values, by key, from 'infer_columns'
+    :return: generator - of the rows
+    """
+    numeric = [(key, kind) for key, kind in types.items()
+               if kind in (int, float)]
+    for row in rows:
+        for key, kind in numeric:
+            row[key] = _convert(row[key], kind)
+        yield row
@@ -0,0 +1,165 @@
+""" This module keeps the selected rows of a table as ranges of the
+indices of the rows, so that selecting thousands of rows, or all of
+them, keeps only a few numbers
+
+Classes:
+--------
+:IntervalSet - A set of integers kept as sorted, separate ranges
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class IntervalSet:
+    """ A set of integers kept as sorted ranges which neither overlap
+    nor touch. Finding whether an integer is in the set takes a binary
+    search of the ranges
+    """
+
+    def __init__(self):
+        """ Initializes an empty set
+        :return: None
+        """
+        self.starts = []                # first integer of each range
+        self.stops = []                 # integer after each range
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, value):
+        _r = bisect_right(self.starts, value) - 1
+        return _r >= 0 and value < self.stops[_r]
+
+    def __iter__(self):
+        for start, stop in zip(self.starts, self.stops):
+            yield from range(start, stop)
+
+    def ranges(self):
+        """ The ranges of the set
+        :return: list - of tuples of the start and the stop of a range
+        """
+        return list(zip(self.starts, self.stops))
+
+    def clear(self):
+        """ Empties the set
+        :return: None
+        """
+        self.starts = []
+        self.stops = []
+        self._count = 0
+
+    def _replace(self, low, high, starts, stops):
+        """ Puts some ranges in the place of the ranges from one position
+        up to another, keeping the count
+        """
+        self._count = self._count - sum(
+            self.stops[_r] - self.starts[_r] for _r in range(low, high)) + \
+            sum(stop - start for start, stop in zip(starts, stops))
+        self.starts[low:high] = starts
+        self.stops[low:high] = stops
+
+    def add(self, start, stop):
+        """ Adds the integers from one up to another
+        :type start: int
+        :param start: the first integer
+        :type stop: int
+        :param stop: the integer after the last
+        :return: None
+        """
+        if start >= stop:
+            return
+        low = bisect_left(self.stops, start)
+        high = bisect_right(self.starts, stop)
+        if low < high:
+            start = min(start, self.starts[low])
+            stop = max(stop, self.stops[high - 1])
+        self._replace(low, high, [start], [stop])
+
+    def discard(self, start, stop):
+        """ Removes the integers from one up to another
+        :type start: int
+        :param start: the first integer
+        :type stop: int
+        :param stop: the integer after the last
+        :return: None
+        """
+        if start >= stop:
+            return
+        low = bisect_right(self.stops, start)
+        high = bisect_left(self.starts, stop)
+        if low >= high:
+            return
+        starts = []
+        stops = []
+        if self.starts[low] < start:
+            starts.append(self.starts[low])
+            stops.append(start)
+        if self.stops[high - 1] > stop:
+            starts.append(stop)
+            stops.append(self.stops[high - 1])
+        self._replace(low, high, starts, stops)
+
+    def update(self, values):
+        """ Adds some integers, in any order
+        :type values: iterable
+        :param values: the integers
+        :return: None
+        """
+        start = None
+        stop = None
+        for value in sorted(values):
+            if start is not None and value <= stop:
+                stop = max(stop, value + 1)
+                continue
+            if start is not None:
+                self.add(start, stop)
+            start = value
+            stop = value + 1
+        if start is not None:
+            self.add(start, stop)
+
+    def insert(self, index, count):
+        """ Moves up the integers from an index by a count, as for rows
+        inserted at that index. The inserted ones are not in the set
+        :type index: int
+        :param index: the index of the first inserted
+        :type count: int
+        :param count: the number inserted
+        :return: None
+        """
+        _r = bisect_left(self.stops, index + 1)
+        if _r < len(self.starts) and self.starts[_r] < index:
+            self.starts.insert(_r + 1, index)
+            self.stops.insert(_r, index)
+            _r = _r + 1
+        for _s in range(_r, len(self.starts)):
+            self.starts[_s] = self.starts[_s] + count
+            self.stops[_s] = self.stops[_s] + count
+
+    def remove(self, indices):
+        """ Takes out some integers and moves down the ones after them,
+        as for rows removed
+        :type indices: list
+        :param indices: sorted list of unique integers removed
+        :return: None
+        """
+        starts = []
+        stops = []
+        count = 0
+        for start, stop in zip(self.starts, self.stops):
+            before = bisect_left(indices, start)
+            inside = bisect_left(indices, stop) - before
+            start = start - before
+            stop = stop - before - inside
+            if start >= stop:
+                continue
+            if stops and stops[-1] == start:
+                stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+            count = count + (stop - start)
+        self.starts = starts
+        self.stops = stops
+        self._count = count
@@ -0,0 +1,410 @@
+""" This module lets a table show rows kept outside of Python, e.g in a
+database or a large file, fetching them a page at a time as the table
+is scrolled
+
+Classes:
+--------
+:DataSource - The methods a source of rows has
+:PagedRowStore - A store of rows taking them from a source in pages,
+    keeping the pages used last and fetching pages in the background
+:SqliteSource - Rows of a table, or a view, of an sqlite3 database
+:CsvSource - Rows of a CSV file, found through an index of the byte
+    offsets of the rows
+
+Note:
+-----
+Only the fetching of the pages happens in the background. The table
+takes in the fetched pages on the main thread, where it works with the
+widgets
+"""
+
+import csv
+import io
+import logging
+import queue
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_right, insort
+from collections import OrderedDict
+
+from paphra_tktable.store import RowStore
+
+_PAGE_SIZE = 100                        # rows fetched at a time
+_CACHE_PAGES = 16                       # pages kept by a store
+
+_log = logging.getLogger(__name__)
+
+
+class DataSource:
+    """ A source of rows. A source implements '__len__' and
+    'get_range', and 'get_by_key' if rows can be looked up by a key.
+    The methods may be called from a thread other than the main one
+    """
+
+    def __len__(self):
+        """ The number of the rows
+        :return: int
+        """
+        raise NotImplementedError
+
+    def get_range(self, start, stop):
+        """ The rows from one index up to another
+        :type start: int
+        :param start: index of the first row
+        :type stop: int
+        :param stop: index after the last row
+        :return: list - of rows[dictionaries]
+        """
+        raise NotImplementedError
+
+    def get_by_key(self, value):
+        """ The row with the given value of the key of the source
+        :param value: the value of the key
+        :return: dict or None - if no row has the value
+        """
+        raise NotImplementedError
+
+
+class PagedRowStore(RowStore):
+    """ Keeps the rows of a source in pages, fetching the pages in a
+    background thread. A row whose page is not yet fetched is given as
+    a row showing that it is loading, and the page is asked for. The
+    table takes in the fetched pages by calling 'poll'. A page which
+    could not be fetched is not asked for again, and its rows show that
+    they are not loaded. The rows cannot be changed through the store,
+    and the table does not sort, search or filter them, as that would
+    fetch all of them
+    """
+
+    writable = False
+    columns_at_hand = False
+
+    def __init__(self, source, _keys_, page_size=None, cache_pages=None,
+                 on_error=None):
+        """ Initializes the store and starts its thread
+        :type source: DataSource
+        :param source: the source of the rows
+        :type _keys_: list
+        :param _keys_: list of strings for the keys of the rows
+        :type page_size: int
+        :param page_size: number of rows in a page
+        :type cache_pages: int
+        :param cache_pages: number of the pages kept. The ones used
+            longest ago are dropped first
+        :type on_error: callable
+        :param on_error: called with the error, on the main thread, when
+            a page could not be fetched. The error is logged if it is None
+        :return: None
+        """
+        self.source = source
+        self._keys_ = list(_keys_)
+        self.page_size = page_size
+        if self.page_size is None:
+            self.page_size = _PAGE_SIZE
+        self.cache_pages = cache_pages
+        if self.cache_pages is None:
+            self.cache_pages = _CACHE_PAGES
+        self.on_error = on_error
+
+        self._count = len(source)
+        self._pages = OrderedDict()
+        self._asked = set()             # pages asked for, not yet taken
+        self._failed = set()            # pages which could not be fetched
+        self._fetched = None            # page and rows fetched by 'fetch'
+        self._requests = queue.LifoQueue()
+        self._results = queue.Queue()
+        self._loading = {key: '' for key in self._keys_}
+        self._loading[self._keys_[0]] = 'Loading...'
+        self._not_loaded = {key: '' for key in self._keys_}
+        self._not_loaded[self._keys_[0]] = 'Not loaded'
+
+        self._thread = threading.Thread(target=self._fetch, daemon=True)
+        self._thread.start()
+
+    def _fetch(self):
+        """ Fetches the pages asked for, in the background thread. The
+        page asked for last is fetched first
+        :return: None
+        """
+        while True:
+            page = self._requests.get()
+            if page is None:
+                return
+            start = page * self.page_size
+            stop = min(start + self.page_size, self._count)
+            try:
+                rows = self.source.get_range(start, stop)
+            except Exception as error:
+                rows = error
+            self._results.put((page, rows))
+
+    def _ask(self, page):
+        """ Asks for a page to be fetched, unless it is kept or already
+        asked for
+        :type page: int
+        :param page: number of the page
+        :return: None
+        """
+        if page in self._pages or page in self._asked or \
+                page in self._failed or page * self.page_size >= self._count:
+            return
+        self._asked.add(page)
+        self._requests.put(page)
+
+    @property
+    def pending(self):
+        """ Whether some pages are asked for and not yet taken in
+        :return: bool
+        """
+        return len(self._asked) > 0
+
+    def poll(self):
+        """ Takes in the pages fetched so far, and tells of the pages
+        which could not be fetched. This is called on the main thread
+        :return: bool - True if any page was taken in, or failed
+        """
+        taken = False
+        while True:
+            try:
+                page, rows = self._results.get_nowait()
+            except queue.Empty:
+                return taken
+            self._asked.discard(page)
+            taken = True
+            if isinstance(rows, Exception):
+                self._failed.add(page)
+                if self.on_error is not None:
+                    self.on_error(rows)
+                else:
+                    _log.error('page %d of the rows could not be fetched',
+                               page, exc_info=rows)
+                continue
+            self._pages[page] = rows
+            self._pages.move_to_end(page)
+            while len(self._pages) > self.cache_pages:
+                self._pages.popitem(last=False)
+
+    def close(self):
+        """ Stops the background thread
+        :return: None
+        """
+        self._requests.put(None)
+
+    def __len__(self):
+        return self._count
+
+    def row(self, index):
+        page = index // self.page_size
+        rows = self._pages.get(page)
+        self._ask(page + 1)
+        if rows is None:
+            if page in self._failed:
+                return self._not_loaded
+            self._ask(page)
+            return self._loading
+        self._pages.move_to_end(page)
+        return rows[index - (page * self.page_size)]
+
+    def fetch(self, index):
+        """ The row at an index, fetched from the source unless its page
+        is kept. The kept pages are not changed, so this may be called
+        from any thread. The page fetched last is kept apart from them,
+        for the rows after it
+        """
+        page = index // self.page_size
+        rows = self._pages.get(page)
+        if rows is None:
+            fetched = self._fetched
+            if fetched is not None and fetched[0] == page:
+                rows = fetched[1]
+            else:
+                start = page * self.page_size
+                rows = self.source.get_range(
+                    start, min(start + self.page_size, self._count))
+                self._fetched = (page, rows)
+        return rows[index % self.page_size]
+
+    def column(self, key):
+        """ The values of a key in all the rows. All the rows are fetched
+        from the source for this, e.g. for sorting or searching
+        """
+        return [row[key] for row in self]
+
+    def __iter__(self):
+        for start in range(0, self._count, self.page_size):
+            stop = min(start + self.page_size, self._count)
+            for row in self.source.get_range(start, stop):
+                yield row
+
+    def insert(self, index, rows):
+        raise NotImplementedError('the rows of a source cannot be changed')
+
+    def remove(self, indices):
+        raise NotImplementedError('the rows of a source cannot be changed')
+
+    def replace(self, index, row):
+        raise NotImplementedError('the rows of a source cannot be changed')
+
+
+class SqliteSource(DataSource):
+    """ The rows of a table, or a view, of an sqlite3 database. Each
+    thread opens a connection of its own to the database file.
+    In the order of the rowid, a page is found from the rowid of the
+    row before the nearest page fetched before it, so scrolling on
+    from the rows fetched costs only the rows read. In any other order,
+    each page is found by counting the rows before it, so the pages far
+    down a large table take long to fetch
+    """
+
+    def __init__(self, database, table, columns=None, order_by=None,
+                 key=None):
+        """ Initializes the source
+        :type database: str
+        :param database: path of the database file
+        :type table: str
+        :param table: name of the table or the view
+        :type columns: list
+        :param columns: names of the columns, which are the keys of
+            the rows. All the columns are used if it is None
+        :type order_by: str
+        :param order_by: the ORDER BY clause of the rows. The rowid is
+            used if it is None, which is the order the pages are found
+            fastest in
+        :type key: str
+        :param key: the column used by 'get_by_key'
+        :return: None
+        """
+        self.database = database
+        self.table = table
+        self.order_by = order_by
+        if self.order_by is None:
+            self.order_by = 'rowid'
+        self.key = key
+        self._local = threading.local()
+        self._by_rowid = order_by is None
+        self._lock = threading.Lock()
+        self._marks = [0]               # indices of the rows after a rowid
+        self._after = {0: None}         # the rowid before each of them
+
+        self.columns = columns
+        if self.columns is None:
+            cur = self._connection().execute(
+                'SELECT * FROM "{}" LIMIT 0'.format(self.table))
+            self.columns = [desc[0] for desc in cur.description]
+        self._select = 'SELECT {} FROM "{}"'.format(
+            ', '.join('"{}"'.format(col) for col in self.columns),
+            self.table)
+        self._select_rowid = self._select.replace('SELECT ',
+                                                  'SELECT rowid, ', 1)
+
+    def _connection(self):
+        """ The connection of the current thread """
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            con = sqlite3.connect(self.database)
+            self._local.con = con
+        return con
+
+    def __len__(self):
+        cur = self._connection().execute(
+            'SELECT COUNT(*) FROM "{}"'.format(self.table))
+        return cur.fetchone()[0]
+
+    def get_range(self, start, stop):
+        if not self._by_rowid:
+            cur = self._connection().execute(
+                '{} ORDER BY {} LIMIT ? OFFSET ?'.format(self._select,
+                                                         self.order_by),
+                (stop - start, start))
+            return [dict(zip(self.columns, values)) for values in cur]
+
+        with self._lock:
+            mark = self._marks[bisect_right(self._marks, start) - 1]
+            rowid = self._after[mark]
+        query = '{} ORDER BY rowid LIMIT ? OFFSET ?'
+        params = (stop - start, start - mark)
+        if rowid is not None:
+            query = '{} WHERE rowid > ? ORDER BY rowid LIMIT ? OFFSET ?'
+            params = (rowid,) + params
+        found = self._connection().execute(
+            query.format(self._select_rowid), params).fetchall()
+        if found:
+            with self._lock:
+                end = start + len(found)
+                if end not in self._after:
+                    insort(self._marks, end)
+                self._after[end] = found[-1][0]
+        return [dict(zip(self.columns, values[1:])) for values in found]
+
+    def get_by_key(self, value):
+        cur = self._connection().execute(
+            '{} WHERE "{}" = ?'.format(self._select, self.key), (value,))
+        values = cur.fetchone()
+        if values is None:
+            return None
+        return dict(zip(self.columns, values))
+
+
+class CsvSource(DataSource):
+    """ The rows of a CSV file whose first row has the keys. The file
+    is read through once to index the byte offset of each row, then
+    only the rows asked for are read
+    """
+
+    def __init__(self, path, encoding='utf-8', **fmtparams):
+        """ Initializes the source, indexing the rows of the file
+        :type path: str
+        :param path: path of the CSV file
+        :type encoding: str
+        :param encoding: encoding of the file
+        :param fmtparams: the format of the file, as for 'csv.reader'
+        :return: None
+        """
+        self.path = path
+        self.encoding = encoding
+        self.fmtparams = fmtparams
+        self.offsets = array('q')
+        self.keys = None
+
+        dialect = csv.reader([], **fmtparams).dialect
+        quote = None
+        if dialect.quotechar is not None and \
+                dialect.quoting != csv.QUOTE_NONE:
+            quote = dialect.quotechar.encode(self.encoding)
+
+        with open(self.path, 'rb') as file:
+            offset = 0
+            start = 0
+            quotes = 0
+            head = b''                  # the lines of the first row
+            for line in file:
+                if quote is not None:
+                    quotes = quotes + line.count(quote)
+                offset = offset + len(line)
+                if self.keys is None:
+                    head = head + line
+                if quotes % 2 == 0:     # the row does not end in quotes
+                    if self.keys is None:
+                        self.keys = next(csv.reader(
+                            io.StringIO(head.decode(self.encoding),
+                                        newline=''), **fmtparams), [])
+                    elif line.strip():
+                        self.offsets.append(start)
+                    start = offset
+                    quotes = 0
+            self.offsets.append(offset)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get_range(self, start, stop):
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        with open(self.path, 'rb') as file:
+            file.seek(self.offsets[start])
+            data = file.read(self.offsets[stop] - self.offsets[start])
+        reader = csv.reader(io.StringIO(data.decode(self.encoding),
+                                        newline=''), **self.fmtparams)
+        return [dict(zip(self.keys, values)) for values in reader if values]
@@ -0,0 +1,94 @@
+""" This module keeps the timings of the work of a table, when they are
+asked for with 'Table.enable_stats()', so that a slow table can be
+traced to the part of its work taking the time
+
+Classes and Functions:
+----------------------
+:TableStats - The count, the total and the largest of the timings of
+    each part of the work, passed on to a callback if one is given
+:timed - Decorates a method of the table so that it is timed when the
+    stats of the table are enabled
+"""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+class TableStats:
+    """ The timings of a table, by the name of the part of the work,
+    e.g 'add_rows', or of the latency, e.g 'click_latency'
+    """
+
+    def __init__(self, callback=None):
+        """ Initializes the stats
+        :type callback: callable
+        :param callback: called with the name and the seconds of each
+            timing as it is taken, e.g to send it to a metrics service
+        :return: None
+        """
+        self.callback = callback
+        self.timings = {}               # name: [count, total, largest]
+        self.waiting = {}               # name: time of the event
+
+    def add(self, name, seconds):
+        """ Adds a timing
+        :type name: str
+        :param name: name of the part of the work
+        :type seconds: float
+        :param seconds: time taken
+        :return: None
+        """
+        entry = self.timings.get(name)
+        if entry is None:
+            self.timings[name] = [1, seconds, seconds]
+        else:
+            entry[0] = entry[0] + 1
+            entry[1] = entry[1] + seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    @contextmanager
+    def timing(self, name):
+        """ Times the work done within the 'with' statement
+        :type name: str
+        :param name: name of the part of the work
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """ The timings so far
+        :return: dict - of the count and the total, mean and largest
+            milliseconds, by name
+        """
+        return {name: {'count': count,
+                       'total_ms': total * 1000,
+                       'mean_ms': total * 1000 / count,
+                       'max_ms': largest * 1000}
+                for name, (count, total, largest) in self.timings.items()}
+
+
+def timed(name):
+    """ Decorates a method of the table so that it is timed under the
+    given name when the stats of the table are enabled
+    :type name: str
+    :param name: name of the part of the work
+    :return: function
+    """
+
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self._stats is None:
+                return method(self, *args, **kwargs)
+            with self._stats.timing(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+
+    return decorate
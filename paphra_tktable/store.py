@@ -0,0 +1,286 @@
+""" This module keeps the rows of a table. The table works with the
+rows through a store, so the rows need not be kept as a list of
+dictionaries
+
+Stores:
+-------
+:RowStore - The methods every store has
+:DictRowStore - Keeps the rows as the list of dictionaries given, as
+    the table always did
+:ColumnarRowStore - Keeps a list, or an array, for each key instead of
+    a dictionary for each row. The dictionary of a row is only made
+    when the row is asked for
+"""
+
+from array import array
+from collections.abc import Sequence
+from itertools import compress
+
+
+class RowStore:
+    """ The rows of a table. A store for another form of keeping the
+    rows implements these methods
+    """
+
+    # whether the rows can be changed through the store, and whether the
+    # values of a key in all the rows are at hand, so that the table
+    # may sort, search and filter them
+    writable = True
+    columns_at_hand = True
+
+    def __len__(self):
+        """ The number of the rows
+        :return: int
+        """
+        raise NotImplementedError
+
+    def row(self, index):
+        """ The row at an index
+        :type index: int
+        :param index: index of the row
+        :return: dict
+        """
+        raise NotImplementedError
+
+    def fetch(self, index):
+        """ The row at an index, for reading all the rows, e.g to export
+        them. A store which gives a stand-in for a row it does not hold
+        yet fetches the row here instead, even if it takes long
+        :type index: int
+        :param index: index of the row
+        :return: dict
+        """
+        return self.row(index)
+
+    def value(self, index, key):
+        """ The value of a key in the row at an index
+        :type index: int
+        :param index: index of the row
+        :type key: str
+        :param key: the key of the column
+        :return: any
+        """
+        return self.row(index)[key]
+
+    def column(self, key):
+        """ The values of a key in all the rows
+        :type key: str
+        :param key: the key of the column
+        :return: sequence - of the values, by the index of the row
+        """
+        return [self.value(_i, key) for _i in range(len(self))]
+
+    def insert(self, index, rows):
+        """ Inserts rows at an index
+        :type index: int
+        :param index: index at which the rows are inserted
+        :type rows: list
+        :param rows: list of rows[dictionaries]
+        :return: None
+        """
+        raise NotImplementedError
+
+    def remove(self, indices):
+        """ Removes the rows at some indices
+        :type indices: list
+        :param indices: sorted list of unique indices of the rows
+        :return: list - of the removed rows
+        """
+        raise NotImplementedError
+
+    def replace(self, index, row):
+        """ Replaces the row at an index
+        :type index: int
+        :param index: index of the row
+        :type row: dict
+        :param row: the new row
+        :return: None
+        """
+        raise NotImplementedError
+
+    def __iter__(self):
+        for _i in range(len(self)):
+            yield self.row(_i)
+
+    @property
+    def rows(self):
+        """ The rows as a sequence of dictionaries
+        :return: sequence
+        """
+        return _RowsView(self)
+
+    @property
+    def pending(self):
+        """ Whether some rows are being fetched in the background. A store
+        fetching rows in the background overrides this and 'poll'
+        :return: bool
+        """
+        return False
+
+    def poll(self):
+        """ Takes in the rows fetched in the background. This is called
+        on the main thread
+        :return: bool - True if any rows were taken in
+        """
+        return False
+
+    def close(self):
+        """ Lets go of anything the store holds, when the table no longer
+        uses it
+        :return: None
+        """
+
+
+class _RowsView(Sequence):
+    """ A sequence of the rows of a store, making the dictionary of a
+    row when it is asked for
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.row(_i)
+                    for _i in range(*index.indices(len(self.store)))]
+        if index < 0:
+            index = index + len(self.store)
+        if index < 0 or index >= len(self.store):
+            raise IndexError('row index out of range')
+        return self.store.row(index)
+
+
+class DictRowStore(RowStore):
+    """ Keeps the rows as a list of dictionaries. The list given is
+    kept and changed in place
+    """
+
+    def __init__(self, rows_list=None):
+        """ Initializes the store
+        :type rows_list: list
+        :param rows_list: list of rows[dictionaries]
+        :return: None
+        """
+        self.rows_list = rows_list
+        if self.rows_list is None:
+            self.rows_list = []
+
+    def __len__(self):
+        return len(self.rows_list)
+
+    def row(self, index):
+        return self.rows_list[index]
+
+    def value(self, index, key):
+        return self.rows_list[index][key]
+
+    def column(self, key):
+        return [row[key] for row in self.rows_list]
+
+    def insert(self, index, rows):
+        self.rows_list[index:index] = rows
+
+    def remove(self, indices):
+        removed = [self.rows_list[_i] for _i in indices]
+        for _i in reversed(indices):
+            del self.rows_list[_i]
+        return removed
+
+    def replace(self, index, row):
+        self.rows_list[index] = row
+
+    def __iter__(self):
+        return iter(self.rows_list)
+
+    @property
+    def rows(self):
+        return self.rows_list
+
+
+class ColumnarRowStore(RowStore):
+    """ Keeps the values of each key in a list of their own, or in an
+    array for a key given a type code, so no dictionary is kept for
+    each row. A row is made into a dictionary when it is asked for.
+    The values of a key given a type code are kept in a list instead
+    once one of them does not fit the array, e.g empty text
+    """
+
+    def __init__(self, _keys_, rows=None, types=None):
+        """ Initializes the store
+        :type _keys_: list
+        :param _keys_: list of strings for the keys of the rows
+        :type rows: list
+        :param rows: list of rows[dictionaries] to be kept
+        :type types: dict
+        :param types: type codes of the 'array' module, by key, for
+            the keys whose values are all numbers, e.g {'qty': 'q'}
+        :return: None
+        """
+        self._keys_ = list(_keys_)
+        self.types = dict(types) if types is not None else {}
+        self.columns = {}
+        for key in self._keys_:
+            if key in self.types:
+                self.columns[key] = array(self.types[key])
+            else:
+                self.columns[key] = []
+        if rows is not None:
+            self.insert(0, list(rows))
+
+    def __len__(self):
+        return len(self.columns[self._keys_[0]])
+
+    def row(self, index):
+        return {key: values[index] for key, values in self.columns.items()}
+
+    def value(self, index, key):
+        return self.columns[key][index]
+
+    def column(self, key):
+        return self.columns[key]
+
+    def _untyped(self, key):
+        """ Keeps the values of a key in a list instead of an array
+        :return: list - the values
+        """
+        del self.types[key]
+        self.columns[key] = list(self.columns[key])
+        return self.columns[key]
+
+    def insert(self, index, rows):
+        for key, values in self.columns.items():
+            new = [row[key] for row in rows]
+            if key in self.types:
+                try:
+                    new = array(self.types[key], new)
+                except (TypeError, OverflowError):
+                    values = self._untyped(key)
+            values[index:index] = new
+
+    def remove(self, indices):
+        removed = [self.row(_i) for _i in indices]
+        if len(indices) > 32:
+            keep = bytearray(b'\x01') * len(self)
+            for _i in indices:
+                keep[_i] = 0
+            for key, values in self.columns.items():
+                if key in self.types:
+                    values = array(self.types[key], compress(values, keep))
+                else:
+                    values = list(compress(values, keep))
+                self.columns[key] = values
+        else:
+            for values in self.columns.values():
+                for _i in reversed(indices):
+                    del values[_i]
+        return removed
+
+    def replace(self, index, row):
+        for key, values in self.columns.items():
+            try:
+                values[index] = row[key]
+            except (TypeError, OverflowError):
+                self._untyped(key)[index] = row[key]
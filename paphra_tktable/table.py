@@ -17,7 +17,6 @@ constant keys for these dictionaries must be used
 Imports:
 --------
 :tk - The main tkinter module
-:Thread - For loading and working in background
 :messagebox - For the confirmation of the deletion of a row
 :ttk - The themed tkinter
 
@@ -37,22 +36,101 @@ keys:
         letter in the string data type
         :'l' - for the Label widget
         :'c' - for the Combobox widget
+        :'e' - for the Entry widget
+The dictionary may also contain these keys, used only for the rows
+being shown:
+    :- convert:  a function giving the value shown and sorted by
+    :- format:   a function giving the text shown from the value
+    :- truncate: if True, text longer than the width is cut
+    :- values:   the list of values of a 'c' column
 
 :- Make a list of dictionaries, each dictionary representing the
 row. Each row must be having all the keys specified in the list
 of keys.
 
 :- Initialize the class called 'Table' passing the neccessary arguments
-:- Call 'add_rows()' passing the neccessary arguments
+:- Call 'add_rows()' passing the neccessary arguments. The row widgets
+already made are reused for the new rows
 
 :- For deleting, select a row and call 'delete_row()'
 :- You can also get the currently selected row by calling the
 method 'get_selected()'
+:- For very large lists of rows, pass 'virtual=True' when initializing
+the table. Only the rows in view then get widgets and these are
+bound again to other rows as the table is scrolled
+:- To change some of the rows without building the table again, call
+'insert_rows()', 'update_row()' or 'remove_rows()'. Calling 'set_rows()'
+with the new rows and the key which identifies them changes only the
+rows which differ
+:- Pass 'renderer="canvas"' when initializing the table to draw the
+cells on the canvas instead of holding each in a widget
+:- Click a column header, or call 'sort_by()' with a key, to sort the
+rows shown by that column. The list of rows itself is not sorted
+:- Call 'search()' with some text, or 'filter()' with a function taking
+a row, to show only the matching rows
+:- Pass 'columnar=True' when initializing the table to keep the rows in
+a list for each key instead of a dictionary for each row
+:- Call 'set_source()' with a source from 'paphra_tktable.source' to
+show rows fetched a page at a time as the table is scrolled
+:- Pass 'smooth_scroll=True' when initializing the table for the Mouse
+Wheel to move the view over a few frames instead of at once
+:- Hold Ctrl or Shift when clicking to select several rows, or use
+the arrow keys, Page Up, Page Down, Home, End and Ctrl-A. Calling
+'delete_row()' deletes all the selected rows after one confirmation, and
+'get_selected_rows()' gives them
+:- Call 'load_csv()', 'load_jsonl()' or 'load_sqlite()' to load the
+rows of a file or a query in chunks. Unless the table has the keys of
+the rows, the columns are worked out from the first rows
+:- Call 'export()' with the path of a CSV or JSON Lines file to write
+the rows shown, in the order shown, to it
+:- Call 'enable_stats()' to time the work of the table, and 'stats()'
+to get the timings and the counts of the widgets of the table
+:- Drag the line at the right of a column header, or call
+'set_column_width()', to change the width of a column. The headers
+scroll with the rows when the table is scrolled sideways
+:- Call 'updates()' for a queue which worker threads, or the tasks of
+an asyncio event loop, post the inserted, changed and deleted rows to.
+The table takes them in once a frame. The other methods of the table
+are only to be called on the thread of the table
 """
 
+import logging
+import queue
+import threading
+import time
 import tkinter as tk
-from threading import Thread
-from tkinter import messagebox as msg, ttk
+from bisect import bisect_left, bisect_right
+from collections.abc import Sized
+from contextlib import nullcontext
+from itertools import chain, compress, islice
+from tkinter import font as tkfont, messagebox as msg, ttk
+
+from paphra_tktable.export import (csv_lines, export_format, jsonl_lines,
+                                   write_lines)
+from paphra_tktable.load import (csv_records, infer_columns, jsonl_records,
+                                 sqlite_records, typed_rows)
+from paphra_tktable.selection import IntervalSet
+from paphra_tktable.source import PagedRowStore
+from paphra_tktable.stats import TableStats, timed
+from paphra_tktable.store import ColumnarRowStore, DictRowStore, RowStore
+from paphra_tktable.updates import UpdateQueue
+
+_ROW_HEIGHT = 26                        # height of each row on the canvas
+_OVERSCAN = 4                           # rows rendered beyond the view
+_CHUNK_SIZE = 500                       # rows loaded at a time
+_FILL_ROWS = 100                        # rows bound at a time, not virtual
+_POLL_MS = 20                           # wait for rows being fetched
+_FRAME_MS = 16                          # wait for applying the wheel
+_WHEEL_ROWS = 3                         # rows scrolled by a wheel notch
+_SMOOTH_PART = 0.35                     # part of the scroll in a frame
+_POOL_SIZE = 500                        # spare slots kept for reuse
+_SHOWN_CELLS = 20000                    # formatted cells kept
+_SAMPLE = 200                           # rows the loaded columns fit
+_HEADER_HEIGHT = _ROW_HEIGHT + 6        # height of the column headers
+_MIN_CELL = 24                          # narrowest a cell is resized to
+_TYPE_CODES = {int: 'q', float: 'd'}    # arrays of the columnar store
+
+_log = logging.getLogger(__name__)
 
 
 def _shade(wl_, color=None):
@@ -68,31 +146,332 @@ def _shade(wl_, color=None):
     if color is None:
         color = ''
     for _w in wl_:
-        if isinstance(_w, type(ttk.Label())):
+        if isinstance(_w, ttk.Label):
             _w['background'] = color
 
 
-def _sep_work(cont, lb_list):
-    """ Create and Situate separators on a given container between
-    widgets
-    :type lb_list: list
-    :param lb_list: list of widgets to be separated using the
-        separators
-    :type cont: any container; e.g Frame, LabelFrame, etc
+def _report_error(error, on_error, what):
+    """ Passes an error of work done in the background to a callback,
+    or logs it if there is no callback, so that the work goes on
+    :type error: Exception
+    :param error: the error
+    :type on_error: callable
+    :param on_error: called with the error
+    :type what: str
+    :param what: what failed, for the log
+    :return: None
+    """
+    if on_error is not None:
+        on_error(error)
+    else:
+        _log.error('%s', what, exc_info=error)
+
+
+def _add_bindtags(widget, tags):
+    """ Adds binding tags to a widget, after its own tag, so that the
+    events of the widget are handled by the bindings of the tags
+    :type widget: any widget
+    :param widget: the widget given the tags
+    :type tags: tuple
+    :param tags: the names of the tags
+    :return: None
+    """
+    own = widget.bindtags()
+    widget.bindtags(own[:1] + tuple(tags) + own[1:])
+
+
+def _modifiers(event):
+    """ Whether Ctrl and Shift are held in an event
+    :type event: event
+    :param event: event of a click or a key
+    :return: tuple - of two bools, for Ctrl and Shift
+    """
+    state = getattr(event, 'state', 0)
+    if not isinstance(state, int):
+        return False, False
+    return bool(state & 0x0004), bool(state & 0x0001)
+
+
+def _make_cell(cont, _type, _width):
+    """ Make the widget for a cell of the given type
+    :type cont: any container; e.g Frame, Canvas, etc
     :param cont: container widget
+    :type _type: str
+    :param _type: type of the widget, e.g 'l', 'c' or 'e'
+    :type _width: int
+    :param _width: width of the column
+    :return: tuple - of the widget and its StringVar, if any
+    """
+    _w = None
+    _v = None
+    if _type == 'l':
+        _w = ttk.Label(cont, width=_width)
+    elif _type == 'c':
+        _w = ttk.Combobox(cont, width=(_width - 3), state='readonly')
+    elif _type == 'e':
+        _v = tk.StringVar()
+        _w = ttk.Entry(cont, textvariable=_v, width=_width,
+                       state='readonly')
+    return _w, _v
+
+
+def _set_cell(_w, _type, _text, _v=None):
+    """ Put a value in the widget of a cell
+    :type _w: widget
+    :param _w: the widget made by '_make_cell'
+    :type _type: str
+    :param _type: type of the widget, e.g 'l', 'c' or 'e'
+    :param _text: the value of the cell
+    :type _v: StringVar
+    :param _v: the variable of an Entry widget
     :return: None
     """
-    _col = 0                            # First column is 0
-    # For situating the separators on the container
-    for _c in range(len(lb_list) + 1):
-        if _c > 0:
-            _col = _col + 2
-        sep = ttk.Separator(cont, orient='vertical')
-        sep.grid(column=_col, row=1, sticky='NS')
+    if _type == 'l':
+        _w['text'] = _text
+    elif _type == 'c':
+        if isinstance(_text, str):      # one of the values of the column
+            _w.set(_text)
+            return
+        _w['values'] = _text
+        if len(_text) > 0:
+            _w.current(0)
+        else:
+            _w.set('')
+    elif _type == 'e':
+        _v.set(_text)
+
+
+def _cell_text(_type, _text, _width):
+    """ The text drawn for a cell by the canvas renderer
+    :type _type: str
+    :param _type: type of the column, e.g 'l', 'c' or 'e'
+    :param _text: the value of the cell
+    :type _width: int
+    :param _width: width of the column, in characters
+    :return: str
+    """
+    if _type == 'c' and not isinstance(_text, str):
+        _text = _text[0] if len(_text) > 0 else ''
+    return str(_text)[:_width]
+
+
+def _sort_key(value):
+    """ The key by which a value is sorted. Numbers, and text which
+    reads as a number, sort by their numeric value before any other
+    text, which sorts without minding the case. Missing values sort
+    last
+    :param value: the value of a cell
+    :return: tuple
+    """
+    if isinstance(value, (list, tuple)):
+        value = value[0] if len(value) > 0 else ''
+    if value is None:
+        return 2, 0
+    if isinstance(value, (int, float)):
+        num = value
+    else:
+        value = str(value)
+        try:
+            num = float(value.replace(',', ''))
+        except ValueError:
+            return 1, value.casefold()
+    if num != num:                      # NaN does not compare
+        return 2, 0
+    return 0, num
+
+
+def _fold_text(value):
+    """ The text of a value as searched, without minding the case
+    :param value: the value of a cell
+    :return: str
+    """
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(_v) for _v in value).casefold()
+    if value is None:
+        return ''
+    return str(value).casefold()
+
+
+# the methods of a column making the cached values of its cells
+_CACHE_MAKERS = {'sort': 'sort_key', 'text': 'search_text'}
+
+
+class _Column:
+    """ A column of the table, worked out once from its title. Besides
+    'text', 'width' and 'type', a title may have:
+        :convert - a function taking the value of a cell and giving
+            the value shown and sorted by, e.g a date from its text
+        :format - a function taking the value, once converted, and
+            giving the text shown, e.g '{:,.2f}'.format
+        :truncate - if True, text longer than the width of the column
+            is cut, ending with '...'
+        :values - the list of values of a 'c' column. The value of a
+            cell is then the one of them it shows
+    """
+
+    def __init__(self, key, title):
+        """ Initializes the column
+        :type key: str
+        :param key: the key of the column
+        :type title: dict
+        :param title: the title of the column
+        :return: None
+        """
+        self.key = key
+        self.text = title['text']
+        self.width = title['width']
+        self.type = title['type']
+        self.convert = title.get('convert')
+        self.format = title.get('format')
+        self.truncate = title.get('truncate', False)
+        self.values = title.get('values')
+        self.plain = self.convert is None and self.format is None and \
+            not self.truncate and self.values is None
+
+    def _shown(self, value):
+        """ The text shown for a value """
+        if self.convert is not None:
+            value = self.convert(value)
+        if self.format is not None:
+            value = self.format(value)
+        value = str(value)
+        if self.truncate and len(value) > self.width:
+            value = value[:max(self.width - 3, 0)] + '...'
+        return value
+
+    def display(self, value):
+        """ What the cell shows for a value; a list of the values for a
+        'c' column without its own values. A value which the functions
+        of the column fail on is shown as it is, e.g on the rows put by
+        'check_rows'
+        :param value: the value of the cell
+        :return: str or list
+        """
+        try:
+            if self.type == 'c' and self.values is None:
+                return [self._shown(_v) for _v in value]
+            return self._shown(value)
+        except (TypeError, ValueError, AttributeError):
+            return value
+
+    def sort_key(self, value):
+        """ The key by which a value is sorted, once converted
+        :param value: the value of the cell
+        :return: tuple
+        """
+        if self.convert is not None:
+            try:
+                value = self.convert(value)
+            except (TypeError, ValueError, AttributeError):
+                pass
+        return _sort_key(value)
+
+    def search_text(self, value):
+        """ The text of a value as searched, which is the text shown
+        :param value: the value of the cell
+        :return: str
+        """
+        if self.plain:
+            return _fold_text(value)
+        return _fold_text(self.display(value))
+
+
+class _WordIndex:
+    """ An inverted index of the words in a column, kept sorted so that
+    the rows with words starting with some text are found without
+    looking at every row.
+    """
 
-        if _c < len(lb_list):
-            lb_list[_c].grid(column=(_col + 1), row=1, sticky='WE',
-                             padx=2, pady=2)
+    def __init__(self, texts):
+        """ Builds the index
+        :type texts: list
+        :param texts: the folded text of the column, by the index of
+            the row
+        :return: None
+        """
+        self.postings = {}              # the rows with each word
+        for _i, text in enumerate(texts):
+            for word in set(text.split()):
+                self.postings.setdefault(word, set()).add(_i)
+        self.words = sorted(self.postings)
+
+    def prefix(self, text):
+        """ The rows having a word which starts with the given text
+        :type text: str
+        :param text: the folded text
+        :return: set - of the indices of the rows
+        """
+        found = set()
+        pos = bisect_left(self.words, text)
+        while pos < len(self.words) and self.words[pos].startswith(text):
+            found.update(self.postings[self.words[pos]])
+            pos = pos + 1
+        return found
+
+    def _add(self, _i, text):
+        """ Adds the words of a row """
+        for word in set(text.split()):
+            rows = self.postings.get(word)
+            if rows is None:
+                rows = self.postings[word] = set()
+                self.words.insert(bisect_left(self.words, word), word)
+            rows.add(_i)
+
+    def _discard(self, _i, text):
+        """ Removes the words of a row """
+        for word in set(text.split()):
+            rows = self.postings.get(word)
+            if rows is None:
+                continue
+            rows.discard(_i)
+            if len(rows) == 0:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def insert(self, index, texts, count):
+        """ Adds rows inserted at an index
+        :type index: int
+        :param index: index at which the rows were inserted
+        :type texts: list
+        :param texts: the folded text of the inserted rows
+        :type count: int
+        :param count: number of the rows before the insertion
+        :return: None
+        """
+        if index < count:
+            for word, rows in self.postings.items():
+                self.postings[word] = {
+                    _i + len(texts) if _i >= index else _i for _i in rows}
+        for _i, text in enumerate(texts, index):
+            self._add(_i, text)
+
+    def remove(self, indices, texts):
+        """ Removes rows
+        :type indices: list
+        :param indices: sorted list of the indices of the removed rows
+        :type texts: list
+        :param texts: the folded text of the removed rows
+        :return: None
+        """
+        for _i, text in zip(indices, texts):
+            self._discard(_i, text)
+        for word, rows in self.postings.items():
+            self.postings[word] = {_i - bisect_left(indices, _i)
+                                   for _i in rows}
+
+    def update(self, _i, old, new):
+        """ Changes the words of a row
+        :type _i: int
+        :param _i: index of the row
+        :type old: str
+        :param old: the folded text before the change
+        :type new: str
+        :param new: the folded text after the change
+        :return: None
+        """
+        if old != new:
+            self._discard(_i, old)
+            self._add(_i, new)
 
 
 def check_rows(rows_list, titles, _keys_):
@@ -120,6 +499,240 @@ def check_rows(rows_list, titles, _keys_):
     return rows_list
 
 
+def _stable_positions(order):
+    """ Finds the longest run of positions whose values keep increasing.
+    These are the rows that keep their relative order after a change
+    of the rows, so they are not moved.
+    :type order: list
+    :param order: the new position of each current row, or None if
+        the row is no longer there
+    :return: set - of the indices in 'order' of the stable rows
+    """
+    tails = []                          # values ending the runs
+    tail_ind = []                       # indices for the values
+    prev = [None] * len(order)
+    for _i, val in enumerate(order):
+        if val is None:
+            continue
+        pos = bisect_left(tails, val)
+        if pos > 0:
+            prev[_i] = tail_ind[pos - 1]
+        if pos == len(tails):
+            tails.append(val)
+            tail_ind.append(_i)
+        else:
+            tails[pos] = val
+            tail_ind[pos] = _i
+
+    stable = set()
+    _i = tail_ind[-1] if tail_ind else None
+    while _i is not None:
+        stable.add(_i)
+        _i = prev[_i]
+    return stable
+
+
+class _RowSlot:
+    """ A row frame with its widgets placed on the canvas of the table.
+    The slot can be bound to any row of the data, so in the virtualized
+    mode a few of them are bound again to the rows scrolled into view.
+    """
+
+    def __init__(self, table):
+        """ Creates the row frame and the widgets on it
+        :type table: Table
+        :param table: the table owning the row
+        :return: None
+        """
+        self.index = None
+        self.table = table
+        self.canvas = table.list_canvas
+        self.frame = ttk.Frame(self.canvas, height=_ROW_HEIGHT)
+        self.widgets = [ttk.Label(self.frame, width=5)]
+        self.variables = {}
+        self.selected = False
+        table._make_row_widgets(self)
+        self.shaded = [_w for _w in self.widgets if isinstance(_w, ttk.Label)]
+
+        # the separators on the left of each cell and on the right of
+        # the last, placed with the cells, and the line under the row
+        self.separators = [ttk.Separator(self.frame, orient='vertical')
+                           for _c in range(len(self.widgets) + 1)]
+        sep11 = ttk.Separator(self.frame, orient='horizontal')
+        sep11.place(x=0, y=_ROW_HEIGHT - 2, relwidth=1)
+        self.geometry = None
+        with table._timing('layout'):
+            self.layout()
+
+        self.item = self.canvas.create_window(0, 0, window=self.frame,
+                                              anchor=tk.NW)
+        for _ww in self.frame.winfo_children():
+            table._widget_slots[str(_ww)] = self
+            _add_bindtags(_ww, (table._click_tag, table._wheel_tag))
+
+    def layout(self):
+        """ Places the cells and the separators at the offsets of the
+        columns of the table, which the headers are placed at too
+        :return: None
+        """
+        table = self.table
+        self.frame.configure(width=table._row_width)
+        for _w, _x, _width in zip(self.widgets, table._cell_x,
+                                  table._cell_w):
+            _w.place(x=_x + 2, y=2, width=_width - 4,
+                     height=_ROW_HEIGHT - 6)
+        for sep, _x in zip(self.separators,
+                           table._cell_x + [table._row_width]):
+            sep.place(x=_x - 2, y=0, width=2, relheight=1)
+        self.geometry = table._geometry
+
+    def hide(self):
+        """ Hides the row frame """
+        self.canvas.itemconfigure(self.item, state='hidden')
+
+    def move(self, _i):
+        """ Shows the row frame at the position of the given index
+        :type _i: int
+        :param _i: index of the row
+        :return: None
+        """
+        self.widgets[0]['text'] = str(_i + 1)
+        self.canvas.coords(self.item, 0, _i * _ROW_HEIGHT)
+        self.canvas.itemconfigure(self.item, state='normal')
+
+    def fill(self, _i):
+        """ Puts the data of the row at the given index in the widgets
+        :type _i: int
+        :param _i: index of the row
+        :return: None
+        """
+        self.table._fill_row_widgets(self, _i)
+
+    def paint(self, selected, color='grey'):
+        """ Shows the row as selected or not selected. Nothing is done
+        if the row is already shown so
+        :type selected: bool
+        :param selected: whether the row is selected
+        :type color: str
+        :param color: color of the selected row
+        :return: None
+        """
+        if selected == self.selected:
+            return
+        self.selected = selected
+        if selected:
+            self.frame.configure(relief='sunken', borderwidth=1)
+            _shade(self.shaded, color)
+        else:
+            self.frame.configure(relief='', borderwidth=0)
+            _shade(self.shaded)
+
+    def destroy(self):
+        """ Destroys the row frame and its widgets """
+        for _ww in self.frame.winfo_children():
+            self.table._widget_slots.pop(str(_ww), None)
+        self.canvas.delete(self.item)
+        self.frame.destroy()
+
+
+class _DrawnSlot:
+    """ A row drawn as items of the canvas of the table instead of
+    widgets. The text of the cells, the line under the row and the
+    shade of the selection are canvas items changed in place when the
+    slot is bound to another row.
+    """
+
+    def __init__(self, table):
+        """ Creates the canvas items of the row
+        :type table: Table
+        :param table: the table owning the row
+        :return: None
+        """
+        self.index = None
+        self.frame = None
+        self.table = table
+        self.canvas = table.list_canvas
+        self.selected = False
+        self._y = 0
+
+        self.rect = self.canvas.create_rectangle(
+            0, 0, table._row_width, _ROW_HEIGHT, fill='', outline='')
+        self.tag = 'row' + str(self.rect)
+        self.canvas.itemconfigure(self.rect, tags=(self.tag,))
+        self.canvas.tag_lower(self.rect)    # under the lines of the grid
+        self.texts = [self.canvas.create_text(
+            0, _ROW_HEIGHT / 2, anchor=tk.W, font='TkDefaultFont',
+            tags=(self.tag,)) for _x in table._cell_x]
+        self.line = self.canvas.create_line(
+            0, _ROW_HEIGHT - 1, table._row_width, _ROW_HEIGHT - 1,
+            fill='grey', tags=(self.tag,))
+        self.geometry = None
+        self.layout()
+
+    def layout(self):
+        """ Moves the text items to the offsets of the columns of the
+        table, and fits the shade and the line to the width of the row
+        :return: None
+        """
+        table = self.table
+        _y = self._y
+        self.canvas.coords(self.rect, 0, _y, table._row_width,
+                           _y + _ROW_HEIGHT)
+        for text, _x in zip(self.texts, table._cell_x):
+            self.canvas.coords(text, _x + 2, _y + (_ROW_HEIGHT / 2))
+        self.canvas.coords(self.line, 0, _y + _ROW_HEIGHT - 1,
+                           table._row_width, _y + _ROW_HEIGHT - 1)
+        self.geometry = table._geometry
+
+    def hide(self):
+        """ Hides the items of the row """
+        self.canvas.itemconfigure(self.tag, state='hidden')
+
+    def move(self, _i):
+        """ Shows the items at the position of the given index
+        :type _i: int
+        :param _i: index of the row
+        :return: None
+        """
+        _y = _i * _ROW_HEIGHT
+        self.canvas.itemconfigure(self.texts[0], text=str(_i + 1))
+        self.canvas.move(self.tag, 0, _y - self._y)
+        self.canvas.itemconfigure(self.tag, state='normal')
+        self._y = _y
+
+    def fill(self, _i):
+        """ Puts the data of the row at the given index in the text
+        items
+        :type _i: int
+        :param _i: index of the row
+        :return: None
+        """
+        for _c, column in enumerate(self.table._columns, 1):
+            self.canvas.itemconfigure(
+                self.texts[_c], text=_cell_text(column.type,
+                                                self.table._display(_i, _c),
+                                                column.width))
+
+    def paint(self, selected, color='grey'):
+        """ Shows the row as selected or not selected. Nothing is done
+        if the row is already shown so
+        :type selected: bool
+        :param selected: whether the row is selected
+        :type color: str
+        :param color: color of the selected row
+        :return: None
+        """
+        if selected == self.selected:
+            return
+        self.selected = selected
+        self.canvas.itemconfigure(self.rect,
+                                  fill=color if selected else '')
+
+    def destroy(self):
+        """ Deletes the items of the row """
+        self.canvas.delete(self.tag)
+
+
 class Table:
     """ Creates the table form as specified. A container e.g Frame,
     is passed at initialization. Then a method is called to create
@@ -127,7 +740,9 @@ class Table:
     """
 
     def __init__(self, container, _keys_=None, titles=None, width=None,
-                 height=None):
+                 height=None, virtual=False, overscan=None,
+                 renderer='widgets', columnar=False, smooth_scroll=False,
+                 pool_size=None, highlight='grey'):
         """ Initializes the Table creation
         :type container: any, e.g ttk.Frame(), ttk.LabelFrame(), etc
         :param container: the container to hold the table structure
@@ -141,14 +756,44 @@ class Table:
         :param width: integer for the width of the table
         :type height: int
         :param height: integer for the height of the Table
+        :type virtual: bool
+        :param virtual: if True, only the rows in view get widgets and
+            these are bound again to other rows when scrolling
+        :type overscan: int
+        :param overscan: number of rows rendered above and below the
+            view in the virtualized mode
+        :type renderer: str
+        :param renderer: 'widgets' to hold the cells in widgets, or
+            'canvas' to draw them on the canvas. With 'canvas', the
+            widgets for the 'c' and 'e' cells are only made when the
+            cells are clicked
+        :type columnar: bool
+        :param columnar: if True, the rows given to 'add_rows' are kept
+            in a list for each key instead of a dictionary for each row.
+            The numbers of the columns found to be int or float by the
+            'load_' methods are kept in arrays
+        :type smooth_scroll: bool
+        :param smooth_scroll: if True, a turn of the Mouse Wheel moves
+            the view over a few frames instead of at once
+        :type pool_size: int
+        :param pool_size: number of row slots, with their widgets, kept
+            for reuse when they are no longer bound to rows, e.g when
+            'add_rows' places new rows. The ones beyond it are destroyed
+        :type highlight: str
+        :param highlight: color of the selected rows
         :return: None
         """
         self.host = ttk.Frame(master=container)
-        self.title_pane = ttk.Frame(self.host)
+
+        # the headers are on a canvas of their own, scrolled sideways
+        # with the canvas of the rows
+        self.title_canvas = tk.Canvas(self.host)
+        self.title_pane = ttk.Frame(self.title_canvas)
 
         # the main canvas that is scrollable
         self.list_canvas = tk.Canvas(self.host)
         self._keys_ = _keys_
+        self._keys_given = _keys_ is not None
 
         # if the keys list id None, then a mock is created
         if self._keys_ is None:
@@ -168,14 +813,99 @@ class Table:
                            {'text': 'Column 3', 'width': 15, 'type': 'l'},
                            {'text': 'Column 4', 'width': 15, 'type': 'l'}]
 
+        # the columns worked out from the titles, and the text shown
+        # for the formatted cells, by the index of the row and the cell
+        self._columns = []
+        self._column_of = {}
+        self._shown = {}
+        self._make_columns()
+
+        # the indices of the selected rows, and the row a range of rows
+        # is selected from. 'sel_ind' is the row clicked or moved to last
+        self._selection = IntervalSet()
+        self._anchor = None
+        self._lit = set()               # the slots painted as selected
+        self.highlight = highlight
+
         # instance variables
         self.sel_ind = None
         self.col_span = None
-        self.rows_list = None
+        self._store = None              # the store keeping the rows
+        self.columnar = columnar
+        self._load_types = None         # types of the rows being loaded
         self.selected_w = None
         self.selected_row = None
         self.mock_rows = []
 
+        # row slots bound to the rows, by the index of the row, and
+        # the slots waiting to be bound again
+        self.virtual = virtual
+        self._overscan = overscan
+        if self._overscan is None:
+            self._overscan = _OVERSCAN
+        self.renderer = renderer
+        self._pool_size = pool_size
+        if self._pool_size is None:
+            self._pool_size = _POOL_SIZE
+        self._slots = {}
+        self._pools = {}                # spare slots, by column layout
+        self._spare = self._pools.setdefault(self._layout(), [])
+        self._reusable = []             # slots of the rows placed before
+        self._widget_slots = {}         # the slot of each row widget
+
+        # the geometry of the columns, in pixels, which the headers and
+        # the rows are placed by. '_geometry' changes with it, so the
+        # slots laid for an older one are laid again when bound or shown
+        self._char_w = 1
+        self._cell_x = []               # left of each cell
+        self._cell_w = []               # width of each cell
+        self._row_width = 0
+        self._geometry = 0
+        self._resize = None             # the cell whose edge is dragged
+        self._resize_job = None
+        self._fit_job = None
+        self._unfit = False             # whether slots may be unlaid
+        self._title_cells = []
+        self._title_handles = []
+        self._grid_lines = []
+        self._editor = None             # the widget over a drawn cell
+        self._render_job = None
+        self._fill_job = None
+        self._fill_from = 0             # rows before it are all bound
+        self._load_job = None
+        self._poll_job = None
+        self._stats = None              # timings, when they are enabled
+
+        # the queue of the changes posted from other threads, and the
+        # index of each row by the value of the key of the queue
+        self._updates = None
+        self._updates_job = None
+        self._updates_error = None
+        self._keyed = None
+
+        # the wheel turned since the view last moved, in pixels, and
+        # the tags binding the clicks and the wheel of all the rows
+        self.smooth_scroll = smooth_scroll
+        self._wheel_pixels = 0.0
+        self._wheel_job = None
+        self._wheel_step = 120          # delta of a notch of the wheel
+        self._click_tag = 'TableClick' + str(id(self))
+        self._wheel_tag = 'TableWheel' + str(id(self))
+
+        # the indices of the rows in the order shown, when sorted or
+        # filtered, and the position of each row in that order
+        self._view = None
+        self._view_pos = None
+        self._view_dirty = False
+        self._sort = None               # key and whether descending
+        self._caches = {}               # values of columns, by kind, key
+        self._title_labels = []
+        self._filter = None             # predicate for the rows shown
+        self._mask = None               # whether each row is shown
+        self._search = None             # text and keys searched last
+        self._word_indexes = {}
+        self._no_rows = check_rows([], self.titles, self._keys_)[0]
+
         # set up mock data in case the table is being run in the
         # stand alone mode
         self.work_on_mock()
@@ -186,6 +916,25 @@ class Table:
         # height of the table
         self._create()
 
+    def _make_columns(self):
+        """ Works out the columns from the keys and the titles
+        :return: None
+        """
+        self._columns = [_Column(key, title)
+                         for key, title in zip(self._keys_, self.titles)]
+        self._column_of = {column.key: column for column in self._columns}
+        self._shown = {}
+
+    def _layout(self):
+        """ The layout of the columns which the slots are made for. Slots
+        are only reused for the same layout
+        :return: tuple
+        """
+        return self.renderer, tuple(
+            (column.type,
+             None if column.values is None else tuple(column.values))
+            for column in self._columns)
+
     def work_on_mock(self):
         """
         Filling the mock rows with mock data
@@ -198,251 +947,2011 @@ class Table:
                     'col3': 'value of col 3 row ' + str(i + 1),
                     'col4': 'value of col 4 row ' + str(i + 1)})
 
+    @property
+    def rows_list(self):
+        """ The rows of the table. This is the list given to 'add_rows',
+        unless the rows are kept by another store, when it is a
+        sequence making the dictionary of a row when asked for
+        :return: sequence or None
+        """
+        if self._store is None:
+            return None
+        return self._store.rows
+
+    def _new_store(self, rows, types=None):
+        """ Makes the store for some rows
+        :type rows: list
+        :param rows: list of rows[dictionaries]
+        :type types: dict
+        :param types: the types of the values, by key, from
+            'infer_columns'. The columns of int and float are kept in
+            arrays by a columnar store
+        :return: RowStore
+        """
+        if self.columnar:
+            codes = {key: _TYPE_CODES[kind] for key, kind in
+                     (types or {}).items() if kind in _TYPE_CODES}
+            return ColumnarRowStore(self._keys_, rows, codes)
+        return DictRowStore(rows)
+
     def _create(self):
         """ Creates the Table """
 
         # situating the host on the master
         self.host.grid(column=0, row=0, sticky='NSE')
 
+        # the geometry of the columns, shared by the headers and rows
+        self._measure_cells()
+
         # situating the title_pane on the host/container
-        self.title_pane.grid(column=0, row=0)
+        self.title_canvas.grid(column=0, row=0, sticky='WE')
+        self.title_canvas.create_window(0, 0, window=self.title_pane,
+                                        anchor=tk.NW)
+        self._make_title_pane()
+
+        # scroll bars for te vertical and horizontal
+        v_scr = tk.Scrollbar(self.host, orient='vertical')
+        h_scr = tk.Scrollbar(self.host, orient='horizontal')
+        self._v_scr = v_scr
+        self._h_scr = h_scr
+
+        # situating the canvas and setting it up to be scrollable
+        self.list_canvas.grid(column=0, row=1, sticky='WENS')
+        self.list_canvas.configure(yscrollcommand=self._on_yscroll,
+                                   xscrollcommand=self._on_xscroll,
+                                   width=self._width,
+                                   height=self._height)
+        self.title_canvas.configure(width=self._width,
+                                    height=_HEADER_HEIGHT)
+
+        v_scr.grid(column=1, row=1, sticky='NS')
+        h_scr.grid(column=0, row=2, sticky='WE')
+        self.host.columnconfigure(0, weight=1)
+        self.host.rowconfigure(1, weight=1)
+
+        v_scr['command'] = self.list_canvas.yview
+        h_scr['command'] = self.list_canvas.xview
+
+        # the clicks and the wheel are bound once for all the widgets
+        if self.list_canvas.tk.call('tk', 'windowingsystem') == 'aqua':
+            self._wheel_step = 1
+        self.host.bind_class(self._click_tag, '<ButtonRelease-1>',
+                             self._click)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.host.bind_class(self._wheel_tag, sequence, self._on_wheel)
+        self._mouse_wheel([self.list_canvas, self.host])
+        self.list_canvas.bind('<Configure>', self._schedule_render, True)
+        self.list_canvas.configure(takefocus=1)
+        self.list_canvas.bind('<Key>', self._on_key, True)
+
+        if self.renderer == 'canvas':
+            self.list_canvas.bind('<ButtonRelease-1>', self._canvas_click,
+                                  True)
+
+    def _make_title_pane(self):
+        """ Makes the column headers on the title pane, between the
+        separators at its top and bottom
+        :return: None
+        """
         cols = len(self.titles)
         self.col_span = (cols * 2) + 2
 
         # adding a separator at the top of the title pane
         titles_top = ttk.Separator(self.title_pane, orient='horizontal')
-        titles_top.grid(column=0, row=0, sticky='WE', columnspan=self.col_span)
+        titles_top.place(x=0, y=0, relwidth=1)
 
         # working on the titles
         self._titles_works()
 
         # adding 2 separators at the bottom of the title pane
-        for i in range(2, 4):
+        for _y in (_HEADER_HEIGHT - 4, _HEADER_HEIGHT - 2):
             t_btm = ttk.Separator(self.title_pane, orient='horizontal')
-            t_btm.grid(column=0, row=i, sticky='WE', columnspan=self.col_span)
+            t_btm.place(x=0, y=_y, relwidth=1)
 
-        # scroll bars for te vertical and horizontal
-        v_scr = tk.Scrollbar(self.host, orient='vertical')
-
-        # situating the canvas and setting it up to be scrollable
-        self.list_canvas.grid(column=0, row=1, sticky='WENS',
-                              columnspan=(self.col_span - 1))
-        self.list_canvas.configure(yscrollcommand=v_scr.set,
-                                   width=self._width,
-                                   height=self._height)
+    def set_columns(self, _keys_, titles):
+        """ Changes the columns of the table. The rows, the sorting and
+        the filter are cleared, as they are of the old columns. The row
+        widgets made for the old columns are kept for them
+        :type _keys_: list
+        :param _keys_: list of strings for the keys of the titles
+        :type titles: list
+        :param titles: list of dictionaries for the column headers
+        :return: None
+        """
+        self.cancel_loading()
+        if self._poll_job is not None:
+            self.list_canvas.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        self._keyed = None
+        self._close_editor()
+        for pos in list(self._slots):
+            self._release(self._slots.pop(pos))
+        self._drop_reusable()
+        self._lit = set()
+        self.sel_ind = None
+        self.selected_row = None
+        self.selected_w = None
+        self._selection.clear()
+        self._anchor = None
 
-        v_scr.grid(column=(self.col_span - 1), row=1, sticky='NS', rowspan=3)
+        self._keys_ = list(_keys_)
+        self._keys_given = True
+        self.titles = titles
+        self._make_columns()
+        self._no_rows = check_rows([], self.titles, self._keys_)[0]
+        self._spare = self._pools.setdefault(self._layout(), [])
+        self._sort = None
+        self._filter = None
+        self._mask = None
+        self._search = None
+        self._caches = {}
+        self._word_indexes = {}
+        self._view = None
+        self._view_pos = None
+        self._view_dirty = False
+
+        for child in self.title_pane.winfo_children():
+            child.destroy()
+        self._measure_cells()
+        self._make_title_pane()
+        if self.renderer == 'canvas':
+            self.list_canvas.delete(*self._grid_lines)
+            self._grid_lines = []
+        self.list_canvas['scrollregion'] = (0, 0, self._row_width, 0)
+
+    def _measure_cells(self):
+        """ Works out the width of each cell from the widths of the
+        columns, in characters, and the offsets of the cells from them
+        :return: None
+        """
+        self._char_w = tkfont.nametofont('TkDefaultFont').measure('0')
+        self._cell_w = [(_width * self._char_w) + 4 for _width in
+                        [5] + [column.width for column in self._columns]]
+        self._place_cells()
+
+    def _place_cells(self):
+        """ Works out the left of each cell, and the width of the rows,
+        from the widths of the cells. Each cell has a separator on its
+        left and the last one on its right too
+        :return: None
+        """
+        _x = 0
+        self._cell_x = []
+        for _width in self._cell_w:
+            _x = _x + 2                 # the separator
+            self._cell_x.append(_x)
+            _x = _x + _width
+        self._row_width = _x + 2
+        self._geometry = self._geometry + 1
+
+    def set_column_width(self, key, width):
+        """ Changes the width of a column. The headers and the rows in
+        view are placed again once the table is idle, and the other
+        rows only when they come into view
+        :type key: str
+        :param key: the key of the column
+        :type width: int
+        :param width: the width of the column, in pixels
+        :return: None
+        """
+        _c = self._keys_.index(key) + 1
+        width = max(_MIN_CELL, int(width))
+        if width == self._cell_w[_c]:
+            return
+        self._cell_w[_c] = width
+        column = self._columns[_c - 1]
+        column.width = max(1, (width - 4) // self._char_w)
+        if column.truncate:
+            self._shown = {}
+        self._place_cells()
+        if self._resize_job is None:
+            self._resize_job = self.list_canvas.after_idle(self._relayout)
+
+    def _start_resize(self, event, _c):
+        """ Starts the dragging of the right edge of a cell of the
+        headers
+        :type event: event
+        :param event: event of the press of the button
+        :type _c: int
+        :param _c: position of the cell, the S/N being 0
+        :return: None
+        """
+        self._resize = (_c, event.x_root, self._cell_w[_c])
 
-        v_scr['command'] = self.list_canvas.yview
-        self._mouse_wheel([self.list_canvas, self.host])
+    def _drag_resize(self, event):
+        """ Resizes the cell whose edge is dragged by the movement of the
+        mouse since the dragging started
+        :type event: event
+        :param event: event of the movement
+        :return: None
+        """
+        if self._resize is None:
+            return
+        _c, start, width = self._resize
+        self.set_column_width(self._columns[_c - 1].key,
+                              width + event.x_root - start)
+
+    def _end_resize(self, event=None):
+        """ Ends the dragging of the edge of a cell """
+        self._resize = None
+
+    @timed('relayout')
+    def _relayout(self):
+        """ Places the headers at the offsets of the cells, and lays
+        again the rows in view. The other rows are laid as they are
+        scrolled into view, so a resize costs the same for any number
+        of rows
+        :return: None
+        """
+        self._resize_job = None
+        self._close_editor()
+        self._place_titles()
+        height = 0
+        if self._store is not None:
+            height = self._row_count() * _ROW_HEIGHT
+        self.list_canvas['scrollregion'] = (0, 0, self._row_width, height)
+        if self.renderer == 'canvas' and self._grid_lines:
+            self._draw_grid_lines(height)
+        self._unfit = True
+        self._fit_visible()
+
+    def _fit_visible(self):
+        """ Lays again the slots in view which were laid for another
+        geometry of the columns, and fills them for the new widths
+        :return: None
+        """
+        self._fit_job = None
+        first, stop = self._rows_in_view()
+        for pos in range(first, stop):
+            slot = self._slots.get(pos)
+            if slot is not None and slot.geometry != self._geometry:
+                slot.layout()
+                slot.fill(slot.index)
+        if self.virtual:
+            self._unfit = False         # the rest are laid when bound
+
+    def _on_xscroll(self, first, last):
+        """ Follows the view of the canvas sideways, moving the headers
+        with it
+        :type first: str
+        :param first: fraction of the left of the view
+        :type last: str
+        :param last: fraction of the right of the view
+        :return: None
+        """
+        self._h_scr.set(first, last)
+        self.title_canvas.xview_moveto(first)
+
+    def _on_yscroll(self, first, last):
+        """ Follows the view of the canvas whenever it moves, whether by
+        the Scrollbar or the Mouse Wheel
+        :type first: str
+        :param first: fraction of the top of the view
+        :type last: str
+        :param last: fraction of the bottom of the view
+        :return: None
+        """
+        self._v_scr.set(first, last)
+        self._schedule_render()
+        if self._unfit and self._fit_job is None:
+            self._fit_job = self.list_canvas.after_idle(self._fit_visible)
+
+    def _schedule_render(self, event=None):
+        """ Schedules the binding of the rows in view to the slots. Many
+        movements before the table is idle lead to only one render
+        :return: None
+        """
+        if (self.virtual or self._fill_job is not None) and \
+                self._render_job is None:
+            self._render_job = self.list_canvas.after_idle(self._render)
 
     def _mouse_wheel(self, widgets):
-        """ Performing the scrolling using the Mouse Wheel
+        """ Lets the given widgets scroll the table using the Mouse Wheel
         :type widgets: list
-        :param widgets: list of widgets that make up the row
+        :param widgets: list of widgets scrolling the table
         :return: None
         """
-
-        def _wheel(event):
-            """ Movement of the wheel """
-            move = int(event.delta / 60)
-            self.list_canvas.yview_scroll(move, tk.UNITS)
-
         for widget in widgets:
-            widget.bind('<MouseWheel>', _wheel, True)
+            _add_bindtags(widget, (self._wheel_tag,))
+
+    @timed('wheel')
+    def _on_wheel(self, event):
+        """ Adds a movement of the wheel to the scroll waiting to be
+        applied. The movements within a frame are applied together, and
+        the parts of a notch given by some mice and touchpads add up
+        instead of being lost
+        :type event: event
+        :param event: event of the wheel, or of the buttons 4 and 5
+            which are the wheel on X11
+        :return: None
+        """
+        self._sample_latency('wheel_latency')
+        if event.num == 4:
+            notches = 1
+        elif event.num == 5:
+            notches = -1
+        else:
+            notches = event.delta / self._wheel_step
+        if _modifiers(event)[1]:        # Shift scrolls sideways
+            self.list_canvas.xview_scroll(-1 if notches > 0 else 1, 'units')
+            return
+        self._wheel_pixels = self._wheel_pixels - \
+            (notches * _WHEEL_ROWS * _ROW_HEIGHT)
+        if self._wheel_job is None:
+            self._wheel_job = self.list_canvas.after(_FRAME_MS,
+                                                     self._apply_wheel)
+
+    @timed('wheel_apply')
+    def _apply_wheel(self):
+        """ Moves the view by the scroll waiting to be applied. With the
+        smooth scroll, only a part of it is applied in each frame
+        :return: None
+        """
+        self._wheel_job = None
+        step = self._wheel_pixels
+        if self.smooth_scroll and abs(step) > 1:
+            step = step * _SMOOTH_PART
+        self._wheel_pixels = self._wheel_pixels - step
+        total = 0
+        if self._store is not None:
+            total = self._row_count() * _ROW_HEIGHT
+        if total > 0:
+            self.list_canvas.yview_moveto(
+                (self.list_canvas.canvasy(0) + step) / total)
+        if self.smooth_scroll and abs(self._wheel_pixels) >= 1:
+            self._wheel_job = self.list_canvas.after(_FRAME_MS,
+                                                     self._apply_wheel)
+        else:
+            self._wheel_pixels = 0.0
 
     def _titles_works(self):
-        """ Positions the titles as column headers and sets the
-        column widths
+        """ Positions the titles as column headers, with the handles on
+        the right of the columns for dragging their widths
         :return: None
         """
-        lb_list = [ttk.Label(self.title_pane, text='S/N', width=5)]
+        lb_list = [ttk.Label(self.title_pane, text='S/N')]
 
-        for title in self.titles:
-            _lb = title['text']
-            _lb = ttk.Label(self.title_pane, text=title['text'],
-                            width=title['width'])
+        for column in self._columns:
+            _lb = ttk.Label(self.title_pane, text=column.text)
+            _lb.bind('<ButtonRelease-1>',
+                     lambda event, k=column.key: self._header_click(k), True)
             lb_list.append(_lb)
-
-        _sep_work(cont=self.title_pane, lb_list=lb_list)
+        self._title_labels = lb_list[1:]
+        self._title_cells = lb_list
+
+        # a handle holding the separator on the left of each cell, and
+        # on the right of the last. Those on the right of the columns
+        # resize them when dragged
+        self._title_handles = []
+        for _c in range(len(lb_list) + 1):
+            handle = ttk.Frame(self.title_pane)
+            sep = ttk.Separator(handle, orient='vertical')
+            sep.place(x=2, y=0, width=2, relheight=1)
+            if _c > 1:
+                handle.configure(cursor='sb_h_double_arrow')
+                for _w in (handle, sep):
+                    _w.bind('<ButtonPress-1>', lambda event, c=_c - 1:
+                            self._start_resize(event, c))
+                    _w.bind('<B1-Motion>', self._drag_resize)
+                    _w.bind('<ButtonRelease-1>', self._end_resize)
+            self._title_handles.append(handle)
+
+        self._place_titles()
         return True
 
-    def add_rows(self, rows_list=None):
-        """ Add given rows on to the canvas of the table
-        :type rows_list: list
+    def _place_titles(self):
+        """ Places the headers and the handles at the offsets of the
+        cells, fitting the title pane to the width of the rows
+        :return: None
+        """
+        self.title_pane.configure(width=self._row_width,
+                                  height=_HEADER_HEIGHT)
+        for _lb, _x, _width in zip(self._title_cells, self._cell_x,
+                                   self._cell_w):
+            _lb.place(x=_x + 2, y=4, width=_width - 4,
+                      height=_ROW_HEIGHT - 4)
+        for handle, _x in zip(self._title_handles,
+                              self._cell_x + [self._row_width]):
+            handle.place(x=_x - 4, y=2, width=6, height=_ROW_HEIGHT)
+        self.title_canvas['scrollregion'] = (0, 0, self._row_width,
+                                             _HEADER_HEIGHT)
+
+    @timed('add_rows')
+    def add_rows(self, rows_list=None, chunk_size=None, on_progress=None,
+                 on_done=None):
+        """ Add given rows on to the canvas of the table. A list is
+        placed at once, while rows from any other iterable, e.g. a
+        generator, are loaded in chunks when the table is idle so that
+        the window keeps responding. A new call cancels the loading of
+        the rows of the previous one.
+        :type rows_list: list, RowStore or any iterable
         :param rows_list: list of rows[dictionaries] to be placed on
-            the canvas
+            the canvas. A RowStore is placed at once and used as it is
+        :type chunk_size: int
+        :param chunk_size: number of rows loaded at a time. If given,
+            a list is also loaded in chunks
+        :type on_progress: callable
+        :param on_progress: called after each chunk with the number of
+            the rows loaded and the total number of rows, which is None
+            if it is not known
+        :type on_done: callable
+        :param on_done: called without arguments when all the rows
+            are loaded
         :return: None
         """
-        self.rows_list = rows_list
-        if self.rows_list is None:
-            self.rows_list = self.mock_rows
+        self.cancel_loading()
+        types = self._load_types
+        self._load_types = None
+        if rows_list is None:
+            rows_list = self.mock_rows
+        if self._poll_job is not None:
+            self.list_canvas.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._store is not None and self._store is not rows_list:
+            self._store.close()
 
+        self.sel_ind = None
         self.selected_row = None
         self.selected_w = None
+        self._selection.clear()
+        self._anchor = None
+
+        # the slots are kept, with their widgets, to be bound to the
+        # new rows instead of making them again
+        self._close_editor()
+        self._lit = set()
+        self._caches = {}
+        self._word_indexes = {}
+        self._shown = {}
+        self._keyed = None
+        self._view = None
+        self._view_pos = None
+        self._fill_from = 0
+        if isinstance(rows_list, RowStore) and \
+                not rows_list.columns_at_hand:
+            self._sort = None           # not kept for a store of a source
+            self._filter = None
+            self._mask = None
+            self._search = None
+            self._mark_sorted()
+        self._view_dirty = self._sort is not None
+
+        if isinstance(rows_list, RowStore) or \
+                (isinstance(rows_list, list) and chunk_size is None):
+            if isinstance(rows_list, RowStore):
+                self._store = rows_list
+            else:
+                self._store = self._new_store(rows_list)
+            self._reset_mask()
+            if not self._view_dirty:
+                self._rebind()          # else bound again in the order
+            self._refresh()
+            if on_progress is not None:
+                on_progress(len(self._store), len(self._store))
+            if on_done is not None:
+                on_done()
+            return
+
+        total = None
+        if isinstance(rows_list, Sized):
+            total = len(rows_list)
+        if chunk_size is None:
+            chunk_size = _CHUNK_SIZE
+        for pos in list(self._slots):   # bound again as the rows come
+            slot = self._slots.pop(pos)
+            slot.index = None
+            slot.hide()
+            self._reusable.append(slot)
+        self._store = self._new_store([], types)
+        self._reset_mask()
+        self._refresh(order=False)
+        self._load_chunk(iter(rows_list), chunk_size, total, on_progress,
+                         on_done)
+
+    @timed('load_chunk')
+    def _load_chunk(self, rows, chunk_size, total, on_progress, on_done):
+        """ Loads the next chunk of rows and schedules the loading of
+        the one after it
+        :type rows: iterator
+        :param rows: iterator of the rows being loaded
+        :return: None
+        """
+        chunk = list(islice(rows, chunk_size))
+        if len(chunk) > 0:
+            # sorted and filtered once, when all the rows are loaded
+            self._insert(len(self._store), chunk)
+            self._refresh(order=False)
+        if on_progress is not None:
+            on_progress(len(self._store), total)
+
+        if len(chunk) < chunk_size:
+            self._load_job = None
+            if self._view_dirty:
+                self._refresh()
+            if self._fill_job is None:
+                self._drop_reusable()
+            if len(self._store) == 0:
+                self.add_rows(check_rows([], self.titles, self._keys_))
+            if on_done is not None:
+                on_done()
+            return
+        self._load_job = self.list_canvas.after(1, self._load_chunk, rows,
+                                                chunk_size, total,
+                                                on_progress, on_done)
+
+    def load_csv(self, path, _keys_=None, titles=None, infer_types=True,
+                 use_mmap=False, encoding='utf-8', chunk_size=None,
+                 on_progress=None, on_done=None, **fmtparams):
+        """ Loads the rows of a CSV file whose first row has the keys.
+        The rows are read and placed in chunks, as 'add_rows' places the
+        rows of a generator
+        :type path: str
+        :param path: path of the CSV file
+        :type _keys_: list
+        :param _keys_: the keys shown. If None, the keys of the table
+            are kept if the file has them, otherwise all the keys of
+            the file are shown
+        :type titles: list
+        :param titles: the titles of the keys shown. If None, they are
+            worked out from the first rows
+        :type infer_types: bool
+        :param infer_types: whether the columns whose first rows are
+            all numbers are made numbers
+        :type use_mmap: bool
+        :param use_mmap: whether the file is read through a memory map
+        :type encoding: str
+        :param encoding: encoding of the file
+        :param fmtparams: the format of the file, as for 'csv.reader'
+        :return: None
+        """
+        keys, rows = csv_records(path, encoding, use_mmap, **fmtparams)
+        self._load_records(keys, rows, _keys_, titles, infer_types,
+                           chunk_size, on_progress, on_done)
+
+    def load_jsonl(self, path, _keys_=None, titles=None, infer_types=True,
+                   use_mmap=False, encoding='utf-8', chunk_size=None,
+                   on_progress=None, on_done=None):
+        """ Loads the rows of a JSON Lines file, each line having an
+        object. The arguments are as for 'load_csv'
+        :return: None
+        """
+        keys, rows = jsonl_records(path, encoding, use_mmap)
+        self._load_records(keys, rows, _keys_, titles, infer_types,
+                           chunk_size, on_progress, on_done)
+
+    def load_sqlite(self, conn, query, params=(), _keys_=None, titles=None,
+                    chunk_size=None, on_progress=None, on_done=None):
+        """ Loads the rows of a query of an sqlite3 database, fetching
+        them in chunks. The keys are the names of the columns of the
+        query. The other arguments are as for 'load_csv'
+        :type conn: sqlite3.Connection or str
+        :param conn: the connection, or the path of the database file
+        :type query: str
+        :param query: the query
+        :type params: tuple or dict
+        :param params: the parameters of the query
+        :return: None
+        """
+        if chunk_size is None:
+            chunk_size = _CHUNK_SIZE
+        keys, rows = sqlite_records(conn, query, params, chunk_size)
+        self._load_records(keys, rows, _keys_, titles, False, chunk_size,
+                           on_progress, on_done)
+
+    def _load_records(self, keys, rows, _keys_, titles, infer_types,
+                      chunk_size, on_progress, on_done):
+        """ Sets the columns for some rows being loaded, if need be, and
+        loads the rows in chunks
+        :type keys: list
+        :param keys: the keys of the rows
+        :type rows: iterator
+        :param rows: iterator of the rows
+        :return: None
+        """
+        sample = list(islice(rows, _SAMPLE))
+        if _keys_ is None:
+            _keys_ = keys
+            if len(keys) == 0 or (self._keys_given and all(
+                    key in keys for key in self._keys_)):
+                _keys_ = self._keys_
+        fitted, types = infer_columns(_keys_, sample)
+        if titles is not None or _keys_ is not self._keys_:
+            self.set_columns(_keys_, fitted if titles is None else titles)
+
+        rows = chain(sample, rows)
+        if infer_types:
+            rows = typed_rows(rows, types)
+        self._load_types = types        # for the arrays of a columnar store
+        if chunk_size is None:
+            chunk_size = _CHUNK_SIZE
+        self.add_rows(rows, chunk_size, on_progress, on_done)
+
+    def set_source(self, source, page_size=None, cache_pages=None,
+                   on_error=None):
+        """ Shows the rows of a source, e.g a database table, fetching
+        them a page at a time as the table is scrolled. The pages are
+        fetched in the background and the rows of a page not yet
+        fetched show that they are loading. The table must be
+        virtualized, so that only the pages of the rows in view are
+        fetched
+        :type source: paphra_tktable.source.DataSource
+        :param source: the source of the rows
+        :type page_size: int
+        :param page_size: number of rows fetched at a time
+        :type cache_pages: int
+        :param cache_pages: number of the pages kept
+        :type on_error: callable
+        :param on_error: called with the error when a page of the rows
+            could not be fetched. The error is logged if it is None
+        :return: PagedRowStore - the store of the rows
+        """
+        if not self.virtual:
+            raise ValueError('a source is only shown by a table made with '
+                             'virtual=True')
+
+        def _failed(error):
+            _report_error(error, on_error,
+                          'a page of the rows could not be fetched')
+
+        store = PagedRowStore(source, self._keys_, page_size, cache_pages,
+                              _failed)
+        self.add_rows(store)
+        return store
+
+    def _poll_store(self):
+        """ Takes in the rows fetched in the background, filling again
+        the slots showing them, and waits for more while any are being
+        fetched
+        :return: None
+        """
+        self._poll_job = None
+        if self._store.poll():
+            self._shown = {}
+            self._rebind()
+        if self._store.pending:
+            self._poll_job = self.list_canvas.after(_POLL_MS,
+                                                    self._poll_store)
+
+    def cancel_loading(self):
+        """ Stops the loading of the rows started by 'add_rows'. The
+        rows loaded so far stay on the table
+        :return: bool - True if the loading was stopped
+        """
+        if self._load_job is None:
+            return False
+        self.list_canvas.after_cancel(self._load_job)
+        self._load_job = None
+        self._drop_reusable()
+        return True
 
-        def des():
-            for _w in self.list_canvas.winfo_children():
-                _w.destroy()
-                del _w
-        Thread(target=des(), daemon=True).start()
-
-        num_rows = len(self.rows_list)
-        scr_v = num_rows * 26
-
-        self.list_canvas['scrollregion'] = (0, 0, 0, scr_v)
-
-        def works():
-
-            y_cord = 0
-            for i in range(len(self.rows_list)):
-                _llb = 'frame' + str(i)
-                _llb = ttk.Frame(self.list_canvas)
-
-                lb_list = []
-                lb_sn = ttk.Label(_llb, text=str(i + 1), width=5)
-                lb_list.append(lb_sn)
-                self._make_row_widgets(_llb, lb_list, i)
-
-                _sep_work(_llb, lb_list)
-
-                sep11 = ttk.Separator(_llb, orient='horizontal')
-                sep11.grid(column=0, row=2, sticky='WE', columnspan=self.col_span)
-
-                if i > 0:
-                    y_cord = y_cord + 26
-
-                self.list_canvas.create_window(-2, y_cord, window=_llb,
-                                               anchor=tk.NW)
-
-                for _ww in _llb.winfo_children():
-                    _ww.bind('<ButtonRelease-1>', self._click, True)
-                    self._mouse_wheel([_ww])
-                self.selected_w = None
+    def _take_slot(self):
+        """ A slot to be bound to a row. The slots of the rows placed
+        before the rows being loaded are taken first, then those kept
+        for reuse, and a slot is only made when there are none
+        :return: _RowSlot or _DrawnSlot
+        """
+        if self._reusable:
+            return self._reusable.pop()
+        if self._spare:
+            return self._spare.pop()
+        if self.renderer == 'canvas':
+            return _DrawnSlot(self)
+        return _RowSlot(self)
+
+    def _drop_reusable(self):
+        """ Releases the slots of the rows placed before which were not
+        bound to the loaded rows, keeping as many as the pool takes
+        :return: None
+        """
+        while self._reusable:
+            self._release(self._reusable.pop())
 
-        Thread(target=works(), daemon=True).start()
+    def _rows_in_view(self):
+        """ The range of the rows in view, with the rows rendered above
+        and below it
+        :return: tuple - of the first and the stop indices
+        """
+        if self._store is None:
+            return 0, 0
+        height = max(self._height, self.list_canvas.winfo_height())
+        first = int(self.list_canvas.canvasy(0) // _ROW_HEIGHT)
+        first = max(first - self._overscan, 0)
+        stop = first + int(height / _ROW_HEIGHT) + 1 + (2 * self._overscan)
+        return first, min(stop, self._row_count())
+
+    def _row_count(self):
+        """ The number of the rows shown
+        :return: int
+        """
+        if self._view is not None:
+            return len(self._view)
+        return len(self._store)
+
+    def _index_at(self, pos):
+        """ The index of the row shown at a position
+        :type pos: int
+        :param pos: position of the row on the table
+        :return: int - index of the row in the list of rows
+        """
+        if self._view is not None:
+            return self._view[pos]
+        return pos
+
+    def _pos_of(self, index):
+        """ The position at which a row is shown
+        :type index: int
+        :param index: index of the row in the list of rows
+        :return: int or None - if the row is not shown
+        """
+        if index is None or self._view is None:
+            return index
+        if self._view_pos is None:
+            self._view_pos = [None] * len(self._store)
+            for pos, _i in enumerate(self._view):
+                if _i >= 0:
+                    self._view_pos[_i] = pos
+        return self._view_pos[index]
+
+    def _row(self, index):
+        """ The row at an index of the list of rows. Index -1 is for the
+        row shown when the filter leaves no rows
+        :type index: int
+        :param index: index of the row in the list of rows
+        :return: dict
+        """
+        if index < 0:
+            return self._no_rows
+        return self._store.row(index)
+
+    def _value(self, index, key):
+        """ The value of a key in the row at an index of the list of
+        rows, without making the dictionary of the row
+        :type index: int
+        :param index: index of the row in the list of rows
+        :type key: str
+        :param key: the key of the column
+        :return: any
+        """
+        if index < 0:
+            return self._no_rows[key]
+        return self._store.value(index, key)
+
+    def _display(self, index, _c):
+        """ What a cell shows, formatted by its column. The formatted
+        cells are kept until their row changes
+        :type index: int
+        :param index: index of the row in the list of rows
+        :type _c: int
+        :param _c: position of the cell in the row, the S/N being 0
+        :return: any
+        """
+        column = self._columns[_c - 1]
+        value = self._value(index, column.key)
+        if column.plain or index < 0:
+            return value
+        cell = (index, _c)
+        shown = self._shown.get(cell)
+        if shown is None:
+            shown = column.display(value)
+            if len(self._shown) >= _SHOWN_CELLS:
+                self._shown = {}
+            self._shown[cell] = shown
+        return shown
+
+    @timed('render')
+    def _render(self):
+        """ Binds the rows in view to slots, releasing the slots of the
+        rows which went out of view so that they are bound again. When
+        the table is not virtualized the other rows are bound after them,
+        a few at a time
+        :return: None
+        """
+        self._render_job = None
+        if self._store is None:
+            return
+        first, stop = self._rows_in_view()
+
+        if self.virtual:
+            for _i in list(self._slots):
+                if _i < first or _i >= stop:
+                    self._release(self._slots.pop(_i))
+        if self._editor is not None and self._editor[2] not in self._slots:
+            self._close_editor()
+
+        for _i in range(first, stop):
+            if _i not in self._slots:
+                self._bind_slot(self._take_slot(), _i)
+        if not self.virtual:
+            self._fill()
+
+        if self._store.pending and self._poll_job is None:
+            self._poll_job = self.list_canvas.after(_POLL_MS,
+                                                    self._poll_store)
+
+    def _fill(self):
+        """ Binds the next rows not yet bound, when the table is not
+        virtualized, and schedules the binding of the rows after them
+        :return: None
+        """
+        if self._fill_job is not None or self._store is None or \
+                self.virtual:
+            return
+        count = self._row_count()
+        pos = self._fill_from
+        bound = 0
+        while pos < count and bound < _FILL_ROWS:
+            if pos not in self._slots:
+                self._bind_slot(self._take_slot(), pos)
+                bound = bound + 1
+            pos = pos + 1
+        self._fill_from = pos
+        if pos < count:
+            self._fill_job = self.list_canvas.after(1, self._fill_rest)
+
+    def _fill_rest(self):
+        """ Binds the next rows not yet bound, as scheduled by '_fill'.
+        The slots of the rows placed before which were not bound again
+        are released once all the rows are loaded and bound
+        :return: None
+        """
+        self._fill_job = None
+        self._fill()
+        if self._fill_job is None and self._load_job is None:
+            self._drop_reusable()
+
+    def _release(self, slot):
+        """ Hides a slot no longer bound to a row so that it can be
+        bound again
+        :type slot: _RowSlot or _DrawnSlot
+        :param slot: the slot being released
+        :return: None
+        """
+        slot.index = None
+        self._lit.discard(slot)         # painted again when bound
+        if slot.frame is not None and slot.frame is self.selected_w:
+            self.selected_w = None
+        if len(self._spare) >= self._pool_size:
+            slot.destroy()
+            return
+        slot.hide()
+        self._spare.append(slot)
+
+    def _bind_slot(self, slot, pos):
+        """ Binds the slot to the row shown at the given position,
+        placing it at that position
+        :type slot: _RowSlot or _DrawnSlot
+        :param slot: the slot being bound
+        :type pos: int
+        :param pos: position of the row on the table
+        :return: None
+        """
+        index = self._index_at(pos)
+        slot.index = index
+        self._slots[pos] = slot
+        if slot.geometry != self._geometry:
+            slot.layout()
+        slot.fill(index)
+        slot.move(pos)
+
+        self._paint(slot, index in self._selection)
+
+    def _rebind(self):
+        """ Binds every slot again to the row now shown at its position,
+        after the order of the rows changed
+        :return: None
+        """
+        self._close_editor()
+        self._fill_from = 0
+        count = self._row_count()
+        for pos in list(self._slots):
+            if pos >= count:
+                self._release(self._slots.pop(pos))
+            else:
+                self._bind_slot(self._slots[pos], pos)
+
+    def _paint(self, slot, selected):
+        """ Shows a slot as selected or not selected
+        :type slot: _RowSlot or _DrawnSlot
+        :param slot: the slot being painted
+        :type selected: bool
+        :param selected: whether the row in the slot is selected
+        :return: None
+        """
+        if selected and slot.index == self.sel_ind:
+            self.selected_w = slot.frame
+        elif slot.frame is not None and slot.frame is self.selected_w:
+            self.selected_w = None
+        slot.paint(selected, self.highlight)
+        if selected:
+            self._lit.add(slot)
+        else:
+            self._lit.discard(slot)
 
-    def _make_row_widgets(self, _llb, lb_list, _i):
+    @timed('_make_row_widgets')
+    def _make_row_widgets(self, slot):
         """ Make the widgets for the row. This is done using the keys
         list and the titles dictionaries
-        :tyoe _llb: Label
-        :param _llb: label, the row main widget
-        :type lb_list: list
-        :param lb_list: list of widgets. This is where the manufactured
-            widgets are put
+        :type slot: _RowSlot
+        :param slot: the slot whose frame holds the widgets. The made
+            widgets are put in its list of widgets
+        :return: None
+        """
+        for column in self._columns:
+            _w, _v = _make_cell(slot.frame, column.type, column.width)
+            if column.type == 'c' and column.values is not None:
+                _w['values'] = column.values
+            if _v is not None:
+                slot.variables[len(slot.widgets)] = _v
+            slot.widgets.append(_w)
+
+    def _fill_row_widgets(self, slot, _i):
+        """ Put the data of a row in the widgets of a slot
+        :type slot: _RowSlot
+        :param slot: the slot holding the widgets
         :type _i: int
         :param _i: integer for the position or row number being worked
             upon
         :return: None
         """
-        for key in self._keys_:
-            _text = self.rows_list[_i][key]
-            _type = self.titles[self._keys_.index(key)]['type']
-            _width = self.titles[self._keys_.index(key)]['width']
-            _w = None
-            if self.titles[self._keys_.index(key)]['type'] == 'l':
-                _w = ttk.Label(_llb, text=_text, width=_width)
-            elif _type == 'c':
-                _w = ttk.Combobox(_llb, values=_text, width=(_width - 3),
-                                  state='readonly')
-                if len(_text) > 0:
-                    _w.current(0)
-            elif _type == 'e':
-                _v = tk.StringVar(value=_text)
-                _w = ttk.Entry(_llb, textvariable=_v, width=_width,
-                               state='readonly')
-
-            lb_list.append(_w)
-
-    def _click(self, event=None):
-        """ Performing the Clicking event on a given row
-        :type event: event
-        :param event: event of button clicking
+        for _c, column in enumerate(self._columns, 1):
+            _set_cell(slot.widgets[_c], column.type, self._display(_i, _c),
+                      slot.variables.get(_c))
+
+    def _nothing_found(self):
+        """ Checks if the table only has the row put by 'check_rows'
+        for an empty list of rows
+        :return: bool
+        """
+        return self._store is not None and len(self._store) == 1 and \
+            self._store.value(0, self._keys_[0]) == 'Nothing is Found!'
+
+    def _refresh(self, order=True):
+        """ Fits the scroll region to the number of rows and binds the
+        rows in view after a change of the rows
+        :type order: bool
+        :param order: if False, the order of the rows is not worked out
+            again, e.g while rows are being loaded
+        :return: None
+        """
+        if self._view_dirty and order:
+            self._make_view()
+            self._rebind()
+        scr_v = self._row_count() * _ROW_HEIGHT
+        self.list_canvas['scrollregion'] = (0, 0, self._row_width, scr_v)
+        if self.renderer == 'canvas':
+            self._draw_grid_lines(scr_v)
+        self._render()
+
+    def _draw_grid_lines(self, height):
+        """ Draws the lines between the columns of the drawn rows. Each
+        line runs the full height of the rows, so the rows themselves
+        need no lines between their cells
+        :type height: int
+        :param height: height of all the rows
+        :return: None
+        """
+        if len(self._grid_lines) == 0:
+            for _x in self._cell_x + [self._row_width]:
+                self._grid_lines.append(self.list_canvas.create_line(
+                    _x - 1, 0, _x - 1, height, fill='grey'))
+        for line, _x in zip(self._grid_lines,
+                            self._cell_x + [self._row_width]):
+            self.list_canvas.coords(line, _x - 1, 0, _x - 1, height)
+
+    def _make_view(self):
+        """ Works out the order in which the rows are shown, from the
+        cached sort keys of the column sorted by
+        :return: None
+        """
+        self._view_dirty = False
+        if self._sort is None and self._mask is None:
+            self._view = None
+            self._view_pos = None
+            return
+
+        view = range(len(self._store))
+        if self._mask is not None:
+            view = list(compress(view, self._mask))
+        if self._sort is not None:
+            key, descending = self._sort
+            view = sorted(view, key=self._column_cache('sort',
+                                                       key).__getitem__)
+            if descending:
+                view.reverse()
+        view = list(view)
+        if len(view) == 0 and self._mask is not None:
+            view = [-1]
+        self._set_view(view)
+
+        # the rows filtered out are no longer selected
+        if self._mask is not None and len(self._selection) > 0:
+            selected = [_i for _i in self._selection if self._mask[_i]]
+            if len(selected) < len(self._selection):
+                self._selection.clear()
+                self._selection.update(selected)
+        if self.sel_ind is not None and self._mask is not None and \
+                not self._mask[self.sel_ind]:
+            self.sel_ind = None
+            self.selected_row = None
+            self.selected_w = None
+        if self._anchor is not None and self._mask is not None and \
+                not self._mask[self._anchor]:
+            self._anchor = None
+
+    def _set_view(self, view):
+        """ Sets the order in which the rows are shown. The position of
+        each row is worked out when first needed
+        :type view: list
+        :param view: list of the indices of the rows in the order shown
+        :return: None
+        """
+        self._view = view
+        self._view_pos = None
+
+    def _column_cache(self, kind, key):
+        """ Values made from the cells of a column, e.g. the sort keys,
+        worked out once and kept up to date as the rows change
+        :type kind: str
+        :param kind: the kind of the values, 'sort' or 'text'
+        :type key: str or tuple
+        :param key: the key of the column, or a tuple of keys for the
+            joined text of several columns
+        :return: list - of the values, by the index of the row
+        """
+        values = self._caches.get((kind, key))
+        if values is None:
+            if isinstance(key, tuple):
+                columns = [self._store.column(k) for k in key]
+                makes = [self._column_of[k].search_text for k in key]
+                values = ['\x1f'.join(make(_v) for make, _v in
+                                       zip(makes, cells))
+                          for cells in zip(*columns)]
+            else:
+                make = getattr(self._column_of[key], _CACHE_MAKERS[kind])
+                values = [make(_v) for _v in self._store.column(key)]
+            self._caches[(kind, key)] = values
+        return values
+
+    def _cache_value(self, kind, key, row):
+        """ The cached value of a row for a column. The text of several
+        columns, searched together, is cached joined by a key of a tuple
+        of keys
+        :type kind: str
+        :param kind: the kind of the value, 'sort' or 'text'
+        :type key: str or tuple
+        :param key: the key of the column, or a tuple of keys
+        :type row: dict
+        :param row: the row
+        :return: any
+        """
+        if isinstance(key, tuple):
+            return '\x1f'.join(self._column_of[k].search_text(row[k])
+                                for k in key)
+        return getattr(self._column_of[key], _CACHE_MAKERS[kind])(row[key])
+
+    def _header_click(self, key):
+        """ Sorts by the column of a header clicked, unless the rows are
+        of a store which cannot be sorted
+        :type key: str
+        :param key: the key of the column
+        :return: None
+        """
+        if self._store is None or self._store.columns_at_hand:
+            self.sort_by(key)
+
+    def _check_columns(self, what):
+        """ Raises TypeError if the rows are of a store which cannot give
+        the values of a key in all the rows without fetching them
+        :type what: str
+        :param what: what was asked of the table, for the error
         :return: None
         """
-        parent_name = event.widget.winfo_parent().split('.')
+        if self._store is not None and not self._store.columns_at_hand:
+            raise TypeError('the rows of {} cannot be {}; sort or filter '
+                            'them in the source instead'.format(
+                                type(self._store).__name__, what))
+
+    def _check_writable(self):
+        """ Raises TypeError if the rows are of a store which cannot be
+        changed, before anything is changed
+        :return: None
+        """
+        if self._store is not None and not self._store.writable:
+            raise TypeError('the rows of {} cannot be changed through the '
+                            'table'.format(type(self._store).__name__))
+
+    def sort_by(self, key=None, descending=None):
+        """ Sorts the rows shown by the values of a key. The list of rows
+        is left as it is and the rows on the table are bound again in
+        the new order. Sorting by the key already sorted by reverses
+        the order, unless 'descending' is given. This is also done by
+        clicking the column header
+        :type key: str
+        :param key: the key to sort by. If None, the rows are shown in
+            the order of the list of rows
+        :type descending: bool
+        :param descending: whether the largest values are shown first
+        :return: None
+        """
+        if key is not None:
+            self._check_columns('sorted')
+        if key is None:
+            self._sort = None
+            self._view_dirty = True
+        elif self._sort is not None and self._sort[0] == key:
+            if descending is None:
+                descending = not self._sort[1]
+            if descending != self._sort[1]:
+                self._sort = (key, descending)
+                if self._view is not None and not self._view_dirty:
+                    self._view.reverse()
+                    self._set_view(self._view)
+                    self._rebind()
+                else:
+                    self._view_dirty = True
+        else:
+            self._sort = (key, bool(descending))
+            self._view_dirty = True
 
-        self.sel_ind = None
-        self.selected_row = None
+        self._mark_sorted()
+        if self._store is not None:
+            self._refresh()
 
-        counts = 0
-        _children = self.list_canvas.winfo_children()
-        if self.selected_w is not None:
-            try:
-                self.selected_w.configure(relief='', borderwidth=0)
-                _shade(self.selected_w.winfo_children())
+    def _mark_sorted(self):
+        """ Marks the header of the column sorted by with an arrow for
+        the order
+        :return: None
+        """
+        for title, _lb, k in zip(self.titles, self._title_labels,
+                                 self._keys_):
+            text = title['text']
+            if self._sort is not None and self._sort[0] == k:
+                text = text + (' \u25bc' if self._sort[1] else ' \u25b2')
+            _lb['text'] = text
+
+    def _reset_mask(self):
+        """ Works out which rows pass the filter, for new rows
+        :return: None
+        """
+        if self._filter is not None:
+            self._mask = bytearray(
+                bool(self._filter(row)) for row in self._store)
+            self._view_dirty = True
+
+    def filter(self, predicate=None, refine=False):
+        """ Shows only the rows for which the predicate is True. The list
+        of rows is left as it is. If no row is left, the row for
+        nothing found is shown
+        :type predicate: callable
+        :param predicate: called with a row[dictionary]. If None, all
+            the rows are shown again
+        :type refine: bool
+        :param refine: if True, only the rows shown now are checked.
+            This is for a predicate that narrows the previous one
+        :return: int - the number of the rows shown
+        """
+        if predicate is not None:
+            self._check_columns('filtered')
+        self._search = None
+        if predicate is None:
+            self._filter = None
+            self._mask = None
+        elif refine and self._mask is not None:
+            self._filter = predicate
+            for _i in compress(range(len(self._mask)), self._mask):
+                if not predicate(self._store.row(_i)):
+                    self._mask[_i] = 0
+        else:
+            self._filter = predicate
+            if self._store is not None:
+                self._reset_mask()
+        return self._apply_filter()
+
+    def _apply_filter(self):
+        """ Shows the rows passing the filter
+        :return: int - the number of the rows shown
+        """
+        self._view_dirty = True
+        if self._store is None:
+            return 0
+        self._refresh()
+        if self._mask is None:
+            return len(self._store)
+        return sum(self._mask)
+
+    def search(self, text, columns=None, prefix=False):
+        """ Shows only the rows with the given text in any of the given
+        columns, without minding the case. When the text only adds to
+        the text searched last, e.g. as it is typed, only the rows
+        found then are searched again
+        :type text: str
+        :param text: the text to search for. If empty, all the rows
+            are shown again
+        :type columns: list
+        :param columns: list of the keys of the columns searched. All
+            the columns are searched if it is None
+        :type prefix: bool
+        :param prefix: if True, each word of the text must be the start
+            of a word in the columns. These are looked up in indexes of
+            the words of the columns, made the first time they are used
+        :return: int - the number of the rows shown
+        """
+        text = _fold_text(text).strip() if prefix else _fold_text(text)
+        if len(text) == 0:
+            return self.filter(None)
+        self._check_columns('searched')
+        if columns is None:
+            columns = self._keys_
+        columns = list(columns)
+
+        # the text of the cells as the search caches keep it, so that the
+        # rows checked later, e.g inserted, pass or fail as they would
+        searched = [self._column_of[key] for key in columns]
+        if prefix:
+            words = text.split()
+
+            def predicate(row):
+                cells = [column.search_text(row[column.key]).split()
+                         for column in searched]
+                return all(any(_w.startswith(word) for cell in cells
+                               for _w in cell) for word in words)
+        else:
+            def predicate(row):
+                return any(text in column.search_text(row[column.key])
+                           for column in searched)
+
+        last = self._search
+        self._filter = predicate
+        self._search = (text, columns, prefix)
+        if self._store is None:
+            return self._apply_filter()
+
+        if prefix:
+            found = None
+            for word in words:
+                rows = set()
+                for key in columns:
+                    rows.update(self._word_index(key).prefix(word))
+                found = rows if found is None else found & rows
+            self._mask = bytearray(len(self._store))
+            for _i in found:
+                self._mask[_i] = 1
+            return self._apply_filter()
+
+        values = self._column_cache(
+            'text', columns[0] if len(columns) == 1 else tuple(columns))
+        if last is not None and self._mask is not None and \
+                last[1:] == (columns, prefix) and last[0] in text:
+            rows = compress(range(len(self._mask)), self._mask)
+        else:
+            rows = range(len(self._store))
+        mask = bytearray(len(self._store))
+        for _i in [_i for _i in rows if text in values[_i]]:
+            mask[_i] = 1
+        self._mask = mask
+        return self._apply_filter()
+
+    def _word_index(self, key):
+        """ The index of the words of a column, made the first time it
+        is used
+        :type key: str
+        :param key: the key of the column
+        :return: _WordIndex
+        """
+        index = self._word_indexes.get(key)
+        if index is None:
+            index = _WordIndex(self._column_cache('text', key))
+            self._word_indexes[key] = index
+        return index
+
+    def _move_slot(self, slot, _i):
+        """ Moves a bound slot to the position of another index without
+        filling its widgets again
+        :type slot: _RowSlot or _DrawnSlot
+        :param slot: the slot being moved
+        :type _i: int
+        :param _i: the new index of the row in the slot
+        :return: None
+        """
+        slot.index = _i
+        slot.move(_i)
+
+    def _insert(self, index, rows):
+        """ Inserts rows in the list of rows, moving down the slots of
+        the rows after them
+        :type index: int
+        :param index: index at which the rows are inserted
+        :type rows: list
+        :param rows: list of rows[dictionaries] being inserted
+        :return: None
+        """
+        count = len(rows)
+        self._close_editor()
+        self._store.insert(index, rows)
+        self._shown = {}
+        if self._keyed is not None and index + count == len(self._store):
+            key, index_of = self._keyed
+            for _i, row in enumerate(rows, index):
+                index_of[row[key]] = _i
+        else:
+            self._keyed = None
+        for (kind, key), values in self._caches.items():
+            new = [self._cache_value(kind, key, row) for row in rows]
+            if kind == 'text' and key in self._word_indexes:
+                self._word_indexes[key].insert(index, new,
+                                               len(values))
+            values[index:index] = new
+        if self._mask is not None:
+            self._mask[index:index] = bytearray(
+                bool(self._filter(row)) for row in rows)
+
+        if self.sel_ind is not None and self.sel_ind >= index:
+            self.sel_ind = self.sel_ind + count
+        if self._anchor is not None and self._anchor >= index:
+            self._anchor = self._anchor + count
+        self._selection.insert(index, count)
+        self._fill_from = min(self._fill_from, index)
+        if self._view is not None or self._view_dirty:
+            self._view_dirty = True
+            return
+
+        slots = {}
+        for _i, slot in self._slots.items():
+            if _i >= index:
+                _i = _i + count
+                self._move_slot(slot, _i)
+            slots[_i] = slot
+        self._slots = slots
+
+    def _remove(self, indices):
+        """ Removes rows from the list of rows, releasing their slots
+        and moving up the slots of the rows after them
+        :type indices: list
+        :param indices: sorted list of unique indices of the rows
+        :return: list - of the removed rows
+        """
+        if len(indices) == 0:
+            return []
+        self._close_editor()
+        self._keyed = None
+        for key, index in self._word_indexes.items():
+            values = self._caches[('text', key)]
+            index.remove(indices, [values[_i] for _i in indices])
+        removed = self._store.remove(indices)
+        self._shown = {}
+        for _i in reversed(indices):
+            for values in self._caches.values():
+                del values[_i]
+            if self._mask is not None:
+                del self._mask[_i]
+
+        self._fill_from = min(self._fill_from, indices[0])
+        if self._view is not None or self._view_dirty:
+            self._view_dirty = True
+        else:
+            slots = {}
+            for _i, slot in self._slots.items():
+                pos = bisect_left(indices, _i)
+                if pos < len(indices) and indices[pos] == _i:
+                    self._release(slot)
+                    continue
+                if pos > 0:
+                    _i = _i - pos
+                    self._move_slot(slot, _i)
+                slots[_i] = slot
+            self._slots = slots
+
+        if self.sel_ind is not None:
+            pos = bisect_left(indices, self.sel_ind)
+            if pos < len(indices) and indices[pos] == self.sel_ind:
+                self.sel_ind = None
+                self.selected_row = None
                 self.selected_w = None
-            except Exception:
-                pass
+            else:
+                self.sel_ind = self.sel_ind - pos
+        if self._anchor is not None:
+            pos = bisect_left(indices, self._anchor)
+            if pos < len(indices) and indices[pos] == self._anchor:
+                self._anchor = None
+            else:
+                self._anchor = self._anchor - pos
+        self._selection.remove(indices)
+        return removed
+
+    def insert_rows(self, index, rows):
+        """ Inserts rows at the given index without building again
+        the rows already on the table
+        :type index: int
+        :param index: index at which the rows are inserted
+        :type rows: list
+        :param rows: list of rows[dictionaries] to be inserted
+        :return: None
+        """
+        self._check_writable()
+        rows = list(rows)
+        if self._store is None or self._nothing_found():
+            self.add_rows(rows)
+            return
+        if len(rows) > 0:
+            index = max(0, min(index, len(self._store)))
+            self._insert(index, rows)
+            self._refresh()
+
+    def update_row(self, index, row):
+        """ Replaces the row at the given index, filling again only the
+        widgets of that row
+        :type index: int
+        :param index: index of the row being updated
+        :type row: dict
+        :param row: the new row
+        :return: None
+        """
+        self._check_writable()
+        self._update(index, row)
+        if self._view_dirty:
+            self._refresh()
+
+    def _update(self, index, row):
+        """ Replaces the row at the given index, filling again the slot
+        of the row. If the sort key of the row changes, the order in
+        which the rows are shown is to be worked out again
+        :type index: int
+        :param index: index of the row being updated
+        :type row: dict
+        :param row: the new row
+        :return: None
+        """
+        if self._keyed is not None and \
+                row.get(self._keyed[0]) != self._store.value(index,
+                                                             self._keyed[0]):
+            self._keyed = None
+        self._store.replace(index, row)
+        for _c in range(1, len(self._columns) + 1):
+            self._shown.pop((index, _c), None)
+        if index == self.sel_ind and self.selected_row is not None:
+            self.selected_row = row
+        for (kind, key), values in self._caches.items():
+            new = self._cache_value(kind, key, row)
+            if kind == 'sort' and self._sort is not None and \
+                    self._sort[0] == key and values[index] != new:
+                self._view_dirty = True
+            if kind == 'text' and key in self._word_indexes:
+                self._word_indexes[key].update(index, values[index], new)
+            values[index] = new
+        if self._mask is not None:
+            passes = bool(self._filter(row))
+            if passes != bool(self._mask[index]):
+                self._mask[index] = passes
+                self._view_dirty = True
+
+        if self._view_dirty:
+            return
+        pos = self._pos_of(index)
+        slot = self._slots.get(pos)
+        if slot is not None:
+            if self._editor is not None and self._editor[2] == pos:
+                self._close_editor()
+            slot.fill(index)
+
+    def remove_rows(self, indices):
+        """ Removes the rows at the given indices without building again
+        the rows left on the table
+        :type indices: list
+        :param indices: list of the indices of the rows to be removed
+        :return: list - of the removed rows
+        """
+        self._check_writable()
+        if self._store is None or self._nothing_found():
+            return []
+        indices = sorted(set(indices))
+        if len(indices) == 0:
+            return []
+        removed = self._remove(indices)
+        if len(self._store) == 0:
+            self.add_rows(check_rows([], self.titles, self._keys_))
+        else:
+            self._refresh()
+        return removed
+
+    def set_rows(self, rows, key=None):
+        """ Makes the table show the given rows, changing only what is
+        different from the current rows. The rows are matched using
+        the values of a key which must be unique for each row
+        :type rows: list
+        :param rows: list of rows[dictionaries] to be on the table
+        :type key: str
+        :param key: the key to match the rows with. The first of the
+            keys is used if it is None
+        :return: None
+        """
+        self._check_writable()
+        rows = list(rows)
+        if self._store is None or self._nothing_found():
+            self.add_rows(rows)
+            return
+        if key is None:
+            key = self._keys_[0]
+
+        new_pos = {row[key]: pos for pos, row in enumerate(rows)}
+        order = [new_pos.get(_v) for _v in self._store.column(key)]
+        stable = _stable_positions(order)
+        if len(stable) < len(order):
+            self._remove([_i for _i in range(len(order))
+                          if _i not in stable])
+
+        _c = 0
+        _p = 0
+        while _p < len(rows):
+            if _c < len(self._store) and \
+                    self._store.value(_c, key) == rows[_p][key]:
+                if self._store.row(_c) != rows[_p]:
+                    self._update(_c, rows[_p])
+                _c = _c + 1
+                _p = _p + 1
+                continue
+            start = _p
+            while _p < len(rows) and \
+                    (_c == len(self._store) or
+                     self._store.value(_c, key) != rows[_p][key]):
+                _p = _p + 1
+            self._insert(_c, rows[start:_p])
+            _c = _c + (_p - start)
+
+        if len(self._store) == 0:
+            self.add_rows(check_rows([], self.titles, self._keys_))
+        else:
+            self._refresh()
+
+    def updates(self, key=None, batch_size=None, max_pending=None,
+                on_error=None):
+        """ Makes a queue which the changes of the rows can be posted to
+        from any thread, or from the tasks of an asyncio event loop. The
+        table takes in the changes waiting once a frame, on its own
+        thread, with the changes of each row merged. A queue made before
+        is closed
+        :type key: str
+        :param key: the key whose value identifies each row. The first
+            of the keys is used if it is None
+        :type batch_size: int
+        :param batch_size: most changes taken in a frame, all of those
+            waiting if it is None
+        :type max_pending: int
+        :param max_pending: number of changes waiting at which the
+            producers of an event loop wait before posting more
+        :type on_error: callable
+        :param on_error: called with the error when some changes cannot
+            be taken in, e.g a row without one of the keys. The error is
+            logged if it is None. Either way the changes after them are
+            still taken in
+        :return: UpdateQueue - the queue
+        """
+        self._check_writable()
+        self.stop_updates()
+        if key is None:
+            key = self._keys_[0]
+        self._updates = UpdateQueue(key, batch_size, max_pending)
+        self._updates_error = on_error
+        self._updates_job = self.list_canvas.after(_FRAME_MS,
+                                                   self._take_updates)
+        return self._updates
+
+    def stop_updates(self):
+        """ Stops taking in the changes of the queue made by 'updates()',
+        and closes it. The changes still waiting are dropped
+        :return: bool - True if there was a queue
+        """
+        if self._updates is None:
+            return False
+        if self._updates_job is not None:
+            self.list_canvas.after_cancel(self._updates_job)
+            self._updates_job = None
+        self._updates.close()
+        self._updates = None
+        return True
 
-        for win_ in _children:
-            w_name = win_.winfo_name()
-            if parent_name[len(parent_name)-1] == w_name:
-                self._select(win_)
-                self.sel_ind = counts
+    def _take_updates(self):
+        """ Takes in the changes waiting in the queue and waits for more
+        until the next frame
+        :return: None
+        """
+        self._updates_job = None
+        updates = self._updates
+        try:
+            changes = updates.drain(updates.batch_size)
+            if changes:
+                with self._timing('updates'):
+                    self._apply_updates(updates.key, changes)
+        except Exception as error:
+            _report_error(error, self._updates_error,
+                          'changes of the rows could not be taken in')
+        finally:
+            if self._updates is updates:    # not stopped meanwhile
+                self._updates_job = self.list_canvas.after(
+                    _FRAME_MS, self._take_updates)
+
+    def _apply_updates(self, key, changes):
+        """ Applies the changes taken from the queue. The changed rows
+        are filled again, then the deleted rows are removed and the
+        inserted rows put at the end, each all at once
+        :type key: str
+        :param key: the key whose value identifies each row
+        :type changes: list
+        :param changes: the changes, from 'UpdateQueue.drain'
+        :return: None
+        """
+        self._check_writable()
+        index_of = {}
+        if self._store is not None and not self._nothing_found():
+            index_of = self._key_index(key)
+        removed = []
+        inserted = []
+        lacking = []                    # rows without some of the keys
+        for value, kind, row in changes:
+            _i = index_of.get(value)
+            if kind == 'delete':
+                if _i is not None:
+                    removed.append(_i)
+                continue
+            if kind == 'update':
+                if _i is None:
+                    continue
+                merged = dict(self._row(_i))
+                merged.update(row)
+                row = merged
+            if any(_k not in row for _k in self._keys_):
+                lacking.append(value)
+            elif _i is None:
+                inserted.append(row)
+            else:
+                self._update(_i, row)
+
+        if removed:
+            self.remove_rows(removed)
+        if inserted:
+            self.insert_rows(len(self._store) if self._store is not None
+                             else 0, inserted)
+        elif not removed and self._view_dirty:
+            self._refresh()
+        if lacking:
+            raise ValueError('the rows of {} {!r} lack some of the keys of '
+                             'the table and were left out'.format(key,
+                                                                  lacking))
+
+    def _key_index(self, key):
+        """ The index of each row by the value of a key. It is kept
+        while the rows are only changed or put at the end
+        :type key: str
+        :param key: the key of the rows
+        :return: dict
+        """
+        if self._keyed is None or self._keyed[0] != key:
+            self._keyed = (key, {value: _i for _i, value in
+                                 enumerate(self._store.column(key))})
+        return self._keyed[1]
 
+    @timed('click')
+    def _click(self, event=None):
+        """ Performing the Clicking event on a given row. Holding Ctrl
+        adds the row to the selection or takes it out, and holding Shift
+        selects the rows from the one clicked before
+        :type event: event
+        :param event: event of button clicking
+        :return: None
+        """
+        self._sample_latency('click_latency')
+        slot = self._widget_slots.get(str(event.widget))
+        if slot is None or slot.index is None:
+            self._deselect()
+            return
+        if isinstance(event.widget, ttk.Label):
+            self.list_canvas.focus_set()
+        self._click_at(self._pos_of(slot.index), event)
+
+    @timed('click')
+    def _canvas_click(self, event=None):
+        """ Performing the Clicking event on the drawn rows. The row and
+        the cell are found from the position of the click. Clicking a
+        'c' or 'e' cell puts a widget over it
+        :type event: event
+        :param event: event of button clicking
+        :return: None
+        """
+        self._sample_latency('click_latency')
+        pos = int(self.list_canvas.canvasy(event.y) // _ROW_HEIGHT)
+        _c = bisect_right(self._cell_x, self.list_canvas.canvasx(event.x))
+        self._close_editor()
+        if pos not in self._slots:
+            self._deselect()
+            return
+        self.list_canvas.focus_set()
+        self._click_at(pos, event)
+        ctrl, shift = _modifiers(event)
+        if self.selected_row is not None and not (ctrl or shift) and \
+                1 < _c <= len(self.titles) + 1:
+            self._open_editor(pos, _c - 1)
+
+    def _click_at(self, pos, event):
+        """ Changes the selection for a click on the row at a position
+        :type pos: int
+        :param pos: position of the row on the table
+        :type event: event
+        :param event: event of button clicking
+        :return: None
+        """
+        ctrl, shift = _modifiers(event)
+        index = self._index_at(pos)
+        if shift and self._pos_of(self._anchor) is not None:
+            self._select_to(pos, keep=ctrl)
+        elif ctrl:
+            if index in self._selection:
+                self._selection.discard(index, index + 1)
+                self._set_current(None)
+                slot = self._slots.get(pos)
+                if slot is not None:
+                    self._paint(slot, False)
+            else:
+                self._select(index, keep=True)
+            self._anchor = index if index >= 0 else None
+        else:
+            self._deselect()
+            self._select(index)
+
+    def _on_key(self, event):
+        """ Moves the selection by the keys. Up, Down, Prior (Page Up),
+        Next (Page Down), Home and End move to another row, which is
+        scrolled into view, selecting the rows on the way if Shift is
+        held. Ctrl-A selects all the rows shown
+        :type event: event
+        :param event: event of the key
+        :return: str or None - 'break' if the key is used
+        """
+        ctrl, shift = _modifiers(event)
+        if ctrl and event.keysym in ('a', 'A'):
+            self.select_all()
+            return 'break'
+        count = self._row_count() if self._store is not None else 0
+        if count == 0 or self._nothing_found() or self._index_at(0) < 0:
+            return None
+        page = max(1, (self.list_canvas.winfo_height() // _ROW_HEIGHT) - 1)
+        moves = {'Up': -1, 'Down': 1, 'Prior': -page, 'Next': page}
+        pos = self._pos_of(self.sel_ind)
+        if event.keysym in moves:
+            if pos is None:
+                pos = 0
             else:
-                if counts == len(_children):
-                    self.selected_w = None
-            counts = counts + 1
+                pos = pos + moves[event.keysym]
+        elif event.keysym == 'Home':
+            pos = 0
+        elif event.keysym == 'End':
+            pos = count - 1
+        else:
+            return None
+        pos = max(0, min(pos, count - 1))
 
-    def _select(self, widget):
+        if shift and self._pos_of(self._anchor) is not None:
+            self._select_to(pos, keep=ctrl)
+        else:
+            self._deselect()
+            self._select(self._index_at(pos))
+        self._see(pos)
+        return 'break'
+
+    def _see(self, pos):
+        """ Scrolls the row at a position into view, if it is not
+        :type pos: int
+        :param pos: position of the row on the table
+        :return: None
+        """
+        total = self._row_count() * _ROW_HEIGHT
+        top = self.list_canvas.canvasy(0)
+        height = self.list_canvas.winfo_height()
+        _y = pos * _ROW_HEIGHT
+        if _y < top:
+            self.list_canvas.yview_moveto(_y / total)
+        elif _y + _ROW_HEIGHT > top + height:
+            self.list_canvas.yview_moveto(
+                (_y + _ROW_HEIGHT - height) / total)
+
+    def _open_editor(self, pos, _c):
+        """ Puts the widget of a 'c' or 'e' cell over the drawn cell
+        :type pos: int
+        :param pos: position of the row on the table
+        :type _c: int
+        :param _c: position of the cell in the row, the S/N being 0
+        :return: None
+        """
+        column = self._columns[_c - 1]
+        if column.type not in ('c', 'e'):
+            return
+        self._close_editor()
+        _w, _v = _make_cell(self.list_canvas, column.type, column.width)
+        if column.type == 'c' and column.values is not None:
+            _w['values'] = column.values
+        _set_cell(_w, column.type, self._display(self._index_at(pos), _c), _v)
+        self._mouse_wheel([_w])
+        item = self.list_canvas.create_window(
+            self._cell_x[_c], pos * _ROW_HEIGHT + 1, window=_w, anchor=tk.NW,
+            width=self._cell_w[_c])
+        self._editor = (_w, item, pos, _v)
+
+    def _close_editor(self):
+        """ Removes the widget put over a drawn cell, if any
+        :return: None
+        """
+        if self._editor is not None:
+            self.list_canvas.delete(self._editor[1])
+            self._editor[0].destroy()
+            self._editor = None
+
+    def _deselect(self):
+        """ Deselecting the selected rows. Only the rows in view are
+        painted again
+        :return: None
+        """
+        self._selection.clear()
+        self._anchor = None
+        self._set_current(None)
+        self._repaint()
+
+    @timed('_select')
+    def _select(self, index, keep=False):
         """ Selecting the entire row of widgets that make up the row
-        of the table. This is the row that has been clicked.
-        This is also aimed at deselecting the previous row before
-        before the new one is selected
-        :type widget: Frame
-        :param widget: frame containing the row widgets. The parent
-            for the row
-        :return: None
-        """
-
-        _wch = widget.winfo_children()
-        selected_txt = _wch[1]['text']
-        if selected_txt != 'Nothing is Found!':
-            self.selected_w = widget
-            self.selected_w.configure(relief='sunken', borderwidth=1)
-            for row in self.rows_list:
-                if selected_txt == row[self._keys_[0]]:
-                    self.selected_row = row
-            _shade(_wch, 'grey')
+        of the table. This is the row that has been clicked. The row
+        is shown as selected when it is in view
+        :type index: int
+        :param index: index of the row in the list of rows
+        :type keep: bool
+        :param keep: if True, the rows selected before stay selected
+        :return: None
+        """
+        if index < 0 or self._nothing_found():
+            self._set_current(None)
+            return
+        if not keep and len(self._selection) > 0:
+            self._selection.clear()
+            self._repaint()
+        self._selection.add(index, index + 1)
+        self._anchor = index
+        self._set_current(index)
+        slot = self._slots.get(self._pos_of(index))
+        if slot is not None:
+            self._paint(slot, True)
+
+    def _select_to(self, pos, keep=False):
+        """ Selects the rows shown from the row the range started from
+        to the row at a position
+        :type pos: int
+        :param pos: position of the row on the table
+        :type keep: bool
+        :param keep: if True, the rows selected before stay selected
+        :return: None
+        """
+        start = self._pos_of(self._anchor)
+        first, last = min(start, pos), max(start, pos)
+        if not keep:
+            self._selection.clear()
+        if self._view is None:
+            self._selection.add(first, last + 1)
         else:
+            self._selection.update(_i for _i in self._view[first:last + 1]
+                                   if _i >= 0)
+        self._set_current(self._index_at(pos))
+        self._repaint()
+
+    def _set_current(self, index):
+        """ Makes a row the one clicked or moved to last, which is the
+        one given by 'get_selected'
+        :type index: int
+        :param index: index of the row in the list of rows, or None
+        :return: None
+        """
+        if index is None or index < 0:
+            self.sel_ind = None
             self.selected_row = None
             self.selected_w = None
+            return
+        self.sel_ind = index
+        self.selected_row = self._store.row(index)
+        slot = self._slots.get(self._pos_of(index))
+        self.selected_w = slot.frame if slot is not None else None
+
+    def _repaint(self):
+        """ Paints the rows bound to slots as selected or not. Only the
+        slots painted as selected, and the slots of the selected rows,
+        are looked at, whichever are fewer, so a click does not go
+        through all the slots
+        :return: None
+        """
+        for slot in list(self._lit):
+            if slot.index is None or slot.index not in self._selection:
+                self._paint(slot, False)
+        if len(self._selection) <= len(self._slots):
+            slots = (self._slots.get(self._pos_of(_i))
+                     for _i in self._selection)
+        else:
+            slots = self._slots.values()
+        for slot in slots:
+            if slot is not None and slot not in self._lit and \
+                    slot.index is not None and slot.index in self._selection:
+                self._paint(slot, True)
+
+    def select_all(self):
+        """ Selects all the rows shown
+        :return: None
+        """
+        if self._store is None or self._nothing_found():
+            return
+        self._selection.clear()
+        if self._view is None:
+            self._selection.add(0, len(self._store))
+        else:
+            self._selection.update(_i for _i in self._view if _i >= 0)
+        if self.sel_ind is None and len(self._selection) > 0:
+            self._set_current(self._index_at(0))
+        self._repaint()
+
+    def clear_selection(self):
+        """ Deselects all the rows
+        :return: None
+        """
+        self._deselect()
+
+    def selected_indices(self):
+        """ The indices of the selected rows in the list of rows
+        :return: list - of the sorted indices
+        """
+        return list(self._selection)
+
+    def get_selected_rows(self):
+        """ The selected rows, in the order of the list of rows
+        :return: list - of rows[dictionaries]
+        """
+        return [self._store.row(_i) for _i in self._selection]
 
     def delete_row(self):
-        """ Delete a selected row
-        :return: None or dict - Previously Selected row
-        """
-        if self.selected_row is not None and \
-            msg.askquestion('Itory: Deletion Confirmation',
-                            'Confirm Deletion?') == u'yes':
-                self.selected_w.destroy()
-                self.rows_list.remove(self.selected_row)
-                prev_selected = self.selected_row
-                self.add_rows(check_rows(self.rows_list, self.titles,
-                                         self._keys_))
-                self._select_new_after_delete()
-                return prev_selected
+        """ Delete the selected rows, after a single confirmation
+        :return: None or dict - Previously Selected row, or the first
+            of the deleted rows
+        """
+        if len(self._selection) == 0:
+            return None
+        self._check_writable()
+        indices = list(self._selection)
+        question = 'Confirm Deletion?'
+        if len(indices) > 1:
+            question = 'Confirm Deletion of {} rows?'.format(len(indices))
+        if msg.askquestion('Itory: Deletion Confirmation',
+                           question) == u'yes':
+            prev_selected = self.selected_row
+            current = self.sel_ind
+            if current is None or current not in self._selection:
+                current = indices[0]
+                prev_selected = self._store.row(current)
+            pos = self._pos_of(current)
+            if pos is not None:
+                pos = pos - sum(1 for _i in indices
+                                if (self._pos_of(_i) or 0) < pos)
+            self.remove_rows(indices)
+            self._select_new_after_delete(pos)
+            return prev_selected
         return None
 
-    def _select_new_after_delete(self):
-        """ Perform the selection after the deleting action
+    def _select_new_after_delete(self, pos):
+        """ Perform the selection after the deleting action. The row
+        taking the place of the deleted one is selected
+        :type pos: int
+        :param pos: position of the deleted row on the table
         :return: None
         """
-        counts = 0
-        list_ = self.list_canvas.winfo_children()
-        for win_ in list_:
-            if counts == len(list_):
-                self.selected_w = None
-                self.selected_row = None
-                self.sel_ind = None
-                break
-            if counts == self.sel_ind:
-                self._select(win_)
-                self.sel_ind = counts
-                break
-            counts = counts + 1
+        if pos is None or pos >= self._row_count():
+            self.selected_w = None
+            self.selected_row = None
+            self.sel_ind = None
+            return
+        self._select(self._index_at(pos))
 
     def get_selected(self):
         """ Get the the text on the first widget of the selected row
@@ -450,6 +2959,196 @@ class Table:
         """
         return self.selected_row
 
+    def export(self, path, fmt=None, header=True, background=False,
+               on_progress=None, on_done=None, on_error=None):
+        """ Writes the rows shown, in the order shown, to a CSV or JSON
+        Lines file. The rows are taken one at a time from the store of
+        the rows, never from the widgets. In the background, the file is
+        written by another thread while the table tells of the progress,
+        and the rows should not be changed until it is done
+        :type path: str
+        :param path: path of the file
+        :type fmt: str
+        :param fmt: 'csv' or 'jsonl'. It is worked out from the extension
+            of the path if it is None
+        :type header: bool
+        :param header: whether the first line of a CSV file has the
+            texts of the titles
+        :type background: bool
+        :param background: if True, the file is written by a thread
+        :type on_progress: callable
+        :param on_progress: called with the number of the rows written
+            so far and the number of all the rows
+        :type on_done: callable
+        :param on_done: called with the number of the rows written, when
+            the file is written in the background
+        :type on_error: callable
+        :param on_error: called with the error if the file could not be
+            written in the background, instead of 'on_done'. The error is
+            logged if it is None
+        :return: int or threading.Thread - the number of the rows written,
+            or the thread writing them
+        """
+        if fmt is None:
+            fmt = export_format(path)
+        if self._store is None or self._nothing_found():
+            total = 0
+            rows = iter([])
+        elif self._view is not None:
+            indices = [_i for _i in self._view if _i >= 0]
+            total = len(indices)
+            rows = (self._store.fetch(_i) for _i in indices)
+        else:
+            total = len(self._store)
+            rows = iter(self._store)
+
+        offset = 0                      # lines before the rows
+        if fmt == 'csv':
+            titles = None
+            if header:
+                titles = [column.text for column in self._columns]
+                offset = 1
+            lines = csv_lines(rows, self._keys_, titles)
+        elif fmt == 'jsonl':
+            lines = jsonl_lines(rows, self._keys_)
+        else:
+            raise ValueError("fmt must be 'csv' or 'jsonl', not {!r}"
+                             .format(fmt))
+
+        if not background:
+            progress = None
+            if on_progress is not None:
+                def progress(count):
+                    on_progress(count - offset, total)
+            return write_lines(lines, path, progress) - offset
+
+        news = queue.Queue()
+
+        def _write():
+            try:
+                count = write_lines(lines, path,
+                                    lambda n: news.put(('progress', n)))
+            except Exception as error:
+                news.put(('error', error))
+                return
+            news.put(('done', count))
+
+        thread = threading.Thread(target=_write)
+        thread.start()
+        self.list_canvas.after(_POLL_MS, self._poll_export, news, offset,
+                               total, on_progress, on_done, on_error)
+        return thread
+
+    def _poll_export(self, news, offset, total, on_progress, on_done,
+                     on_error):
+        """ Tells of the progress of an export in the background, on the
+        main thread, and waits for more until it is done
+        :type news: queue.Queue
+        :param news: the progress put by the thread writing the file
+        :return: None
+        """
+        while True:
+            try:
+                kind, value = news.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'error':
+                _report_error(value, on_error, 'the rows could not be '
+                                               'exported')
+                return
+            if on_progress is not None:
+                on_progress(value - offset, total)
+            if kind == 'done':
+                if on_done is not None:
+                    on_done(value - offset)
+                return
+        self.list_canvas.after(_POLL_MS, self._poll_export, news, offset,
+                               total, on_progress, on_done, on_error)
+
+    def enable_stats(self, callback=None):
+        """ Starts timing the work of the table, e.g placing the rows,
+        making the row widgets, clicking and scrolling, and the latency
+        from a click or a turn of the wheel until the table is idle
+        again, i.e. repainted
+        :type callback: callable
+        :param callback: called with the name and the seconds of each
+            timing as it is taken
+        :return: None
+        """
+        self._stats = TableStats(callback)
+
+    def disable_stats(self):
+        """ Stops timing the work of the table
+        :return: None
+        """
+        self._stats = None
+
+    def stats(self):
+        """ The timings taken since the stats were enabled, and the
+        counts of the rows, the row frames, the widgets and the canvas
+        items of the table as they are now
+        :return: dict
+        """
+        frames = 0
+        if self.renderer != 'canvas':
+            frames = len(self._slots) + len(self._spare)
+        widgets = 0
+        stack = [self.host]
+        while stack:
+            widgets = widgets + 1
+            stack.extend(stack.pop().winfo_children())
+        return {'rows': self._row_count() if self._store is not None else 0,
+                'row_frames': frames,
+                'bound_rows': len(self._slots),
+                'widgets': widgets,
+                'canvas_items': len(self.list_canvas.find_all()),
+                'timings': (self._stats.snapshot()
+                            if self._stats is not None else {})}
+
+    def _timing(self, name):
+        """ Times the work done within the 'with' statement, when the
+        stats are enabled
+        :type name: str
+        :param name: name of the part of the work
+        :return: context manager
+        """
+        if self._stats is None:
+            return nullcontext()
+        return self._stats.timing(name)
+
+    def _sample_latency(self, name):
+        """ Takes the time of an event to time how long the table takes
+        to be idle after it. Only one event of a name is timed at a time
+        :type name: str
+        :param name: name of the latency
+        :return: None
+        """
+        if self._stats is None or name in self._stats.waiting:
+            return
+        self._stats.waiting[name] = time.perf_counter()
+        self.list_canvas.after_idle(self._repainted, name, 0)
+
+    def _repainted(self, name, passes):
+        """ Adds the latency of an event once the table is idle. The
+        rows are rendered, and then repainted by Tk, in later passes of
+        the idle work, so this waits for them
+        :type name: str
+        :param name: name of the latency
+        :type passes: int
+        :param passes: passes of the idle work waited for so far
+        :return: None
+        """
+        if self._stats is None or name not in self._stats.waiting:
+            return
+        if self._wheel_job is not None:
+            self.list_canvas.after(1, self._repainted, name, passes)
+            return
+        if passes < 1 or self._render_job is not None:
+            self.list_canvas.after_idle(self._repainted, name, passes + 1)
+            return
+        self._stats.add(name, time.perf_counter() -
+                        self._stats.waiting.pop(name))
+
 
 if __name__ == '__main__':
     root = tk.Tk()
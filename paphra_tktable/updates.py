@@ -0,0 +1,188 @@
+""" This module keeps the changes of the rows of a table posted from any
+thread, e.g workers reading a feed or tasks of an asyncio event loop,
+until the table takes them in on its own thread. The changes of a row
+are merged while they wait, so a row updated many times between two
+frames of the table is only changed once
+
+Classes:
+--------
+:UpdateQueue - The changes waiting for the table, by the value of the
+    key identifying each row
+
+Note:
+-----
+Only the methods of the queue may be called from other threads. The
+table takes in the changes on its own thread, once a frame, after
+'Table.updates()' has made the queue
+"""
+
+import asyncio
+import threading
+from itertools import islice
+
+_INSERT = 'insert'
+_UPDATE = 'update'
+_DELETE = 'delete'
+
+
+class UpdateQueue:
+    """ The changes of the rows waiting for the table. Each row is known
+    by the value of its key, so a change is kept for each row:
+        :insert - the row is put at the end of the table, or in the place
+            of the row with the same value of the key
+        :update - the values given are changed in the row, which is
+            left as it is if it is not on the table
+        :delete - the row is removed
+    An update of a row waiting to be inserted or updated is merged with
+    it, and a deletion takes the place of any change waiting
+    """
+
+    def __init__(self, key, batch_size=None, max_pending=None):
+        """ Initializes the queue
+        :type key: str
+        :param key: the key whose value identifies each row
+        :type batch_size: int
+        :param batch_size: most changes taken in by the table in a
+            frame, all of them if it is None
+        :type max_pending: int
+        :param max_pending: number of changes waiting at which the
+            producers of an event loop wait in 'wait_room' and 'feed'
+        :return: None
+        """
+        self.key = key
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.closed = False
+        self._lock = threading.Lock()
+        self._changes = {}              # value of the key: [kind, row]
+        self._waiters = []              # loops and events waiting room
+
+    def __len__(self):
+        with self._lock:
+            return len(self._changes)
+
+    def insert(self, row):
+        """ Posts a row to be inserted, or to be put in the place of the
+        row with the same value of the key
+        :type row: dict
+        :param row: the row, with all the keys of the table
+        :return: None
+        """
+        self._post(row[self.key], _INSERT, row)
+
+    def update(self, row):
+        """ Posts some values of a row to be changed
+        :type row: dict
+        :param row: the key and the values changed
+        :return: None
+        """
+        self._post(row[self.key], _UPDATE, row)
+
+    def delete(self, value):
+        """ Posts a row to be removed
+        :param value: the value of the key of the row
+        :return: None
+        """
+        self._post(value, _DELETE, None)
+
+    def post(self, kind, item):
+        """ Posts a change of any kind
+        :type kind: str
+        :param kind: 'insert', 'update' or 'delete'
+        :param item: the row, or the value of the key of the row for
+            'delete'
+        :return: None
+        """
+        if kind == _INSERT:
+            self.insert(item)
+        elif kind == _UPDATE:
+            self.update(item)
+        elif kind == _DELETE:
+            self.delete(item)
+        else:
+            raise ValueError('unknown change {!r}'.format(kind))
+
+    def _post(self, value, kind, row):
+        """ Keeps a change of a row, merged with the change waiting for
+        the row, if any
+        """
+        if row is not None:
+            row = dict(row)             # the producer may change its own
+        with self._lock:
+            if self.closed:
+                raise RuntimeError('the queue is closed')
+            change = self._changes.get(value)
+            if change is None or kind != _UPDATE:
+                self._changes[value] = [kind, row]
+            elif change[0] != _DELETE:
+                change[1].update(row)
+
+    def drain(self, limit=None):
+        """ Takes the changes waiting, in the order the rows were first
+        changed. This is called by the table on its own thread
+        :type limit: int
+        :param limit: most changes taken, all of them if it is None
+        :return: list - of tuples of the value of the key, the kind of
+            the change and the row
+        """
+        with self._lock:
+            if limit is None or limit >= len(self._changes):
+                changes = self._changes
+                self._changes = {}
+            else:
+                changes = {value: self._changes.pop(value) for value in
+                           list(islice(self._changes, limit))}
+            waiters = []
+            if self.max_pending is None or \
+                    len(self._changes) < self.max_pending:
+                waiters = self._waiters
+                self._waiters = []
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+        return [(value, kind, row) for value, (kind, row) in changes.items()]
+
+    def close(self):
+        """ Stops the posting of changes. The producers waiting for room
+        are let go
+        :return: None
+        """
+        with self._lock:
+            self.closed = True
+            waiters = self._waiters
+            self._waiters = []
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    async def wait_room(self):
+        """ Waits, in an event loop, until fewer than 'max_pending'
+        changes are waiting for the table
+        :return: None
+        """
+        if self.max_pending is None:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.closed or len(self._changes) < self.max_pending:
+                    return
+                event = asyncio.Event()
+                self._waiters.append((loop, event))
+            await event.wait()
+
+    async def feed(self, changes):
+        """ Posts the changes of an asynchronous iterable, e.g of the
+        messages of a socket, waiting for room whenever too many
+        changes are waiting for the table
+        :type changes: async iterable
+        :param changes: tuples of the kind of the change and the row,
+            or the value of the key for 'delete'
+        :return: int - number of the changes posted
+        """
+        count = 0
+        async for kind, item in changes:
+            await self.wait_room()
+            self.post(kind, item)
+            count = count + 1
+        return count
@@ -0,0 +1,89 @@
+""" Tests of changing the rows of a table without building it again.
+The longest run of rows kept in place needs no display; the tests of
+the table need one and are skipped without it
+"""
+
+import random
+import tkinter as tk
+import unittest
+
+from paphra_tktable import table as tktable
+from paphra_tktable.table import _stable_positions
+
+_KEYS = ['id', 'price']
+_TITLES = [{'text': 'Id', 'width': 6, 'type': 'l'},
+           {'text': 'Price', 'width': 10, 'type': 'l'}]
+
+
+class StablePositionsTest(unittest.TestCase):
+
+    def test_longest_increasing_run(self):
+        self.assertEqual(_stable_positions([]), set())
+        self.assertEqual(_stable_positions([0, 1, 2]), {0, 1, 2})
+        self.assertEqual(_stable_positions([2, 0, 1, 3]), {1, 2, 3})
+        self.assertIn(_stable_positions([None, 1, None, 0, 2]),
+                      ({1, 4}, {3, 4}))
+
+    def test_the_run_is_the_longest(self):
+        rand = random.Random(5)
+        for _n in range(200):
+            order = rand.sample(range(12), rand.randrange(12))
+            order = [None if rand.random() < 0.2 else value
+                     for value in order]
+            stable = sorted(_stable_positions(order))
+            values = [order[_i] for _i in stable]
+            self.assertNotIn(None, values)
+            self.assertEqual(values, sorted(values))
+            best = [0] * len(order)     # longest run ending at each
+            for _i, value in enumerate(order):
+                if value is None:
+                    continue
+                best[_i] = 1 + max([best[_j] for _j in range(_i)
+                                    if order[_j] is not None and
+                                    order[_j] < value] + [0])
+            self.assertEqual(len(stable), max(best + [0]))
+
+
+class TableChangesTest(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest('no display')
+        self.root.withdraw()
+        self.table = tktable.Table(self.root, list(_KEYS), _TITLES)
+        self.table.add_rows([{'id': _i, 'price': _i * 10}
+                             for _i in range(5)])
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def _rows(self):
+        return [(row['id'], row['price']) for row in self.table.rows_list]
+
+    def test_set_rows_with_the_same_order(self):
+        self.table.set_rows([{'id': _i, 'price': _i * 10 + 1}
+                             for _i in range(5)], key='id')
+        self.assertEqual(self._rows(), [(_i, _i * 10 + 1)
+                                        for _i in range(5)])
+
+    def test_set_rows_with_rows_added_only(self):
+        rows = [{'id': _i, 'price': _i * 10} for _i in range(7)]
+        self.table.set_rows(rows, key='id')
+        self.assertEqual([row['id'] for row in self.table.rows_list],
+                         list(range(7)))
+
+    def test_set_rows_moving_and_removing_rows(self):
+        self.table.set_rows([{'id': 4, 'price': 40}, {'id': 0, 'price': 0},
+                             {'id': 9, 'price': 90}, {'id': 2, 'price': 2}],
+                            key='id')
+        self.assertEqual(self._rows(), [(4, 40), (0, 0), (9, 90), (2, 2)])
+
+    def test_remove_no_rows(self):
+        self.assertEqual(self.table.remove_rows([]), [])
+        self.assertEqual(len(self.table.rows_list), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+""" Tests of writing rows out to CSV and JSON Lines files
+"""
+
+import csv
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from paphra_tktable import export
+
+_KEYS = ['id', 'name']
+
+
+class ExportTest(unittest.TestCase):
+
+    def test_csv_lines(self):
+        rows = [{'id': 1, 'name': 'a, "b"', 'other': 'left out'},
+                {'id': 2, 'name': 'c'}]
+        lines = list(export.csv_lines(rows, _KEYS, ['Id', 'Name']))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(list(csv.reader(lines)),
+                         [['Id', 'Name'], ['1', 'a, "b"'], ['2', 'c']])
+
+    def test_csv_lines_without_a_header(self):
+        lines = list(export.csv_lines([{'id': 1, 'name': 'a'}], _KEYS))
+        self.assertEqual(lines, ['1,a\r\n'])
+
+    def test_jsonl_lines(self):
+        day = datetime.date(2020, 1, 2)
+        lines = list(export.jsonl_lines([{'id': 1, 'name': day}], _KEYS))
+        self.assertEqual(lines, ['{"id": 1, "name": "2020-01-02"}\n'])
+
+    def test_write_lines(self):
+        progress = []
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'rows.jsonl')
+            rows = ({'id': _i, 'name': str(_i)} for _i in range(2500))
+            count = export.write_lines(export.jsonl_lines(rows, _KEYS), path,
+                                       progress.append)
+            with open(path, encoding='utf-8') as file:
+                written = [json.loads(line) for line in file]
+        self.assertEqual(count, 2500)
+        self.assertEqual(progress, [1000, 2000])
+        self.assertEqual(written[-1], {'id': 2499, 'name': '2499'})
+
+    def test_export_format(self):
+        self.assertEqual(export.export_format('a/Rows.CSV'), 'csv')
+        self.assertEqual(export.export_format('rows.ndjson'), 'jsonl')
+        with self.assertRaises(ValueError):
+            export.export_format('rows.xlsx')
+
+
+if __name__ == '__main__':
+    unittest.main()
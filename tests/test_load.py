@@ -0,0 +1,122 @@
+""" Tests of reading the rows of files and queries, and of working out
+their columns
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from paphra_tktable import load
+
+
+class RecordsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _file(self, name, text):
+        path = os.path.join(self.folder.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(text)
+        return path
+
+    def test_csv_records(self):
+        path = self._file('rows.csv', 'id,name,note\r\n1,"a, b",x\r\n'
+                                      '2,c\r\n\r\n3,d,y\r\n')
+        for use_mmap in (False, True):
+            keys, rows = load.csv_records(path, use_mmap=use_mmap)
+            self.assertEqual(keys, ['id', 'name', 'note'])
+            self.assertEqual(list(rows), [
+                {'id': '1', 'name': 'a, b', 'note': 'x'},
+                {'id': '2', 'name': 'c', 'note': ''},
+                {'id': '3', 'name': 'd', 'note': 'y'}])
+
+    def test_csv_records_of_an_empty_file(self):
+        path = self._file('empty.csv', '')
+        for use_mmap in (False, True):
+            keys, rows = load.csv_records(path, use_mmap=use_mmap)
+            self.assertEqual(keys, [])
+            self.assertEqual(list(rows), [])
+
+    def test_jsonl_records(self):
+        path = self._file('rows.jsonl', '{"id": 1, "name": "a"}\n\n'
+                                        '{"id": 2, "note": "x"}\n')
+        keys, rows = load.jsonl_records(path)
+        self.assertEqual(keys, ['id', 'name', 'note'])
+        self.assertEqual(list(rows), [
+            {'id': 1, 'name': 'a', 'note': None},
+            {'id': 2, 'name': None, 'note': 'x'}])
+
+    def test_sqlite_records(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE logs (id INTEGER, level TEXT)')
+        conn.executemany('INSERT INTO logs VALUES (?, ?)',
+                         [(_i, 'error' if _i % 2 else 'info')
+                          for _i in range(7)])
+        keys, rows = load.sqlite_records(
+            conn, 'SELECT id, level FROM logs WHERE level = ?', ('error',),
+            batch_size=2)
+        self.assertEqual(keys, ['id', 'level'])
+        self.assertEqual([row['id'] for row in rows], [1, 3, 5])
+        conn.close()
+
+    def test_sqlite_records_close_the_connection_they_open(self):
+        path = os.path.join(self.folder.name, 'rows.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE logs (id INTEGER)')
+        conn.executemany('INSERT INTO logs VALUES (?)',
+                         [(_i,) for _i in range(5)])
+        conn.commit()
+        conn.close()
+        connect = sqlite3.connect
+        for read in (list, next):
+            opened = []
+
+            def _connect(*args, **kwargs):
+                opened.append(connect(*args, **kwargs))
+                return opened[-1]
+
+            with mock.patch.object(load.sqlite3, 'connect', _connect):
+                _keys, rows = load.sqlite_records(path,
+                                                  'SELECT id FROM logs')
+            read(rows)
+            rows.close()                # as when the loading is cancelled
+            with self.assertRaises(sqlite3.ProgrammingError):
+                opened[0].execute('SELECT 1')
+
+
+class ColumnsTest(unittest.TestCase):
+
+    def test_infer_columns(self):
+        sample = [{'n': '1', 'x': '1.5', 's': 'abc', 'e': ''},
+                  {'n': '', 'x': '2', 's': '3', 'e': ''}]
+        titles, types = load.infer_columns(['n', 'x', 's', 'e'], sample)
+        self.assertEqual(types, {'n': int, 'x': float, 's': str, 'e': str})
+        self.assertEqual([title['type'] for title in titles], ['l'] * 4)
+        self.assertEqual(titles[0]['width'], 4)
+
+    def test_widths_are_kept_within_limits(self):
+        titles, _types = load.infer_columns(['k'], [{'k': 'x' * 100}])
+        self.assertEqual(titles[0]['width'], 40)
+
+    def test_values_other_than_text_are_left(self):
+        _titles, types = load.infer_columns(
+            ['a', 'b', 'c'], [{'a': 1, 'b': 2.5, 'c': True},
+                              {'a': None, 'b': 1, 'c': False}])
+        self.assertEqual(types, {'a': int, 'b': float, 'c': None})
+
+    def test_typed_rows(self):
+        rows = [{'n': '1', 'x': '2.5', 's': '7'}, {'n': '', 'x': 'na',
+                                                  's': 'b'}]
+        types = {'n': int, 'x': float, 's': str}
+        self.assertEqual(list(load.typed_rows(rows, types)), [
+            {'n': 1, 'x': 2.5, 's': '7'}, {'n': '', 'x': 'na', 's': 'b'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
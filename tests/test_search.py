@@ -0,0 +1,59 @@
+""" Tests of the index of the words of a column, which the search of
+the rows starting with some text goes through
+"""
+
+import random
+import unittest
+
+from paphra_tktable.table import _WordIndex
+
+_WORDS = ['ant', 'anna', 'bee', 'beet', 'cat', 'cab', 'a']
+
+
+def _prefix(texts, text):
+    return {_i for _i, row in enumerate(texts)
+            if any(word.startswith(text) for word in row.split())}
+
+
+class WordIndexTest(unittest.TestCase):
+
+    def test_prefix(self):
+        index = _WordIndex(['ant bee', 'cat', 'beet ant', ''])
+        self.assertEqual(index.prefix('be'), {0, 2})
+        self.assertEqual(index.prefix('ant'), {0, 2})
+        self.assertEqual(index.prefix('dog'), set())
+
+    def test_against_a_scan(self):
+        rand = random.Random(3)
+
+        def text():
+            return ' '.join(rand.sample(_WORDS, rand.randrange(3)))
+
+        texts = [text() for _n in range(20)]
+        index = _WordIndex(texts)
+        for _n in range(300):
+            kind = rand.choice(['insert', 'remove', 'update'])
+            if kind == 'insert':
+                at = rand.randrange(len(texts) + 1)
+                new = [text() for _m in range(rand.randrange(1, 4))]
+                index.insert(at, new, len(texts))
+                texts[at:at] = new
+            elif kind == 'remove' and texts:
+                gone = sorted(rand.sample(range(len(texts)),
+                                          rand.randrange(1, min(4, len(texts))
+                                                         + 1)))
+                index.remove(gone, [texts[_i] for _i in gone])
+                for _i in reversed(gone):
+                    del texts[_i]
+            elif texts:
+                _i = rand.randrange(len(texts))
+                new = text()
+                index.update(_i, texts[_i], new)
+                texts[_i] = new
+            for probe in ('a', 'an', 'be', 'beet', 'c', 'z'):
+                self.assertEqual(index.prefix(probe), _prefix(texts, probe))
+        self.assertEqual(index.words, sorted(index.postings))
+
+
+if __name__ == '__main__':
+    unittest.main()
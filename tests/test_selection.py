@@ -0,0 +1,84 @@
+""" Tests of the set of the selected rows, kept as ranges, against a set
+of the same integers
+"""
+
+import random
+import unittest
+
+from paphra_tktable.selection import IntervalSet
+
+
+class IntervalSetTest(unittest.TestCase):
+
+    def _check(self, values, expected):
+        self.assertEqual(list(values), sorted(expected))
+        self.assertEqual(len(values), len(expected))
+        for start, stop in zip(values.starts, values.stops):
+            self.assertLess(start, stop)
+        for stop, start in zip(values.stops, values.starts[1:]):
+            self.assertLess(stop, start)    # neither overlap nor touch
+
+    def test_add_merges_touching_ranges(self):
+        values = IntervalSet()
+        values.add(5, 8)
+        values.add(0, 2)
+        values.add(2, 5)
+        self.assertEqual(values.ranges(), [(0, 8)])
+        self.assertIn(7, values)
+        self.assertNotIn(8, values)
+
+    def test_discard_splits_a_range(self):
+        values = IntervalSet()
+        values.add(0, 10)
+        values.discard(3, 5)
+        self.assertEqual(values.ranges(), [(0, 3), (5, 10)])
+        self.assertEqual(len(values), 8)
+
+    def test_insert_and_remove_move_the_integers(self):
+        values = IntervalSet()
+        values.update([1, 2, 3, 7])
+        values.insert(2, 3)
+        self._check(values, {1, 5, 6, 10})
+        values.remove([0, 5, 8])
+        self._check(values, {0, 4, 7})
+
+    def test_against_a_set(self):
+        rand = random.Random(7)
+        for _n in range(200):
+            values = IntervalSet()
+            expected = set()
+            for _m in range(30):
+                kind = rand.choice(['add', 'discard', 'update', 'insert',
+                                    'remove', 'clear'])
+                start = rand.randrange(60)
+                stop = start + rand.randrange(1, 10)
+                if kind == 'add':
+                    values.add(start, stop)
+                    expected.update(range(start, stop))
+                elif kind == 'discard':
+                    values.discard(start, stop)
+                    expected.difference_update(range(start, stop))
+                elif kind == 'update':
+                    some = rand.sample(range(60), rand.randrange(6))
+                    values.update(some)
+                    expected.update(some)
+                elif kind == 'insert':
+                    count = stop - start
+                    values.insert(start, count)
+                    expected = {value + count if value >= start else value
+                                for value in expected}
+                elif kind == 'remove':
+                    gone = sorted(rand.sample(range(70), rand.randrange(8)))
+                    values.remove(gone)
+                    expected = {value - sum(1 for _g in gone if _g < value)
+                                for value in expected if value not in gone}
+                else:
+                    values.clear()
+                    expected = set()
+                self._check(values, expected)
+                probe = rand.randrange(80)
+                self.assertEqual(probe in values, probe in expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
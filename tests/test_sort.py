@@ -0,0 +1,65 @@
+""" Tests of sorting the rows. The keys the values are sorted by need
+no display; the tests of the table need one and are skipped without it
+"""
+
+import tkinter as tk
+import unittest
+
+from paphra_tktable import table as tktable
+from paphra_tktable.table import _sort_key
+
+_KEYS = ['id', 'price']
+_TITLES = [{'text': 'Id', 'width': 6, 'type': 'l'},
+           {'text': 'Price', 'width': 10, 'type': 'l'}]
+
+
+class SortKeyTest(unittest.TestCase):
+
+    def test_numbers_then_text_then_missing(self):
+        values = ['b', None, '10', 2, 'A', '1,000', float('nan'), 3.5, '']
+        self.assertEqual(sorted(values, key=_sort_key)[:6],
+                         [2, 3.5, '10', '1,000', '', 'A'])
+        self.assertEqual(sorted(values, key=_sort_key)[6], 'b')
+
+    def test_lists_sort_by_their_first_value(self):
+        self.assertEqual(_sort_key(['2', 'x']), _sort_key(2))
+        self.assertEqual(_sort_key([]), _sort_key(''))
+
+
+class TableSortTest(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest('no display')
+        self.root.withdraw()
+        self.table = tktable.Table(self.root, list(_KEYS), _TITLES)
+        self.table.add_rows([{'id': _i, 'price': price} for _i, price in
+                             enumerate(['30', 5, '1,000', 'n/a', 7])])
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def _shown(self):
+        return [self.table._index_at(pos)
+                for pos in range(self.table._row_count())]
+
+    def test_sort_and_reverse(self):
+        self.table.sort_by('price')
+        self.assertEqual(self._shown(), [1, 4, 0, 2, 3])
+        self.table.sort_by('price')
+        self.assertEqual(self._shown(), [3, 2, 0, 4, 1])
+        self.table.sort_by(None)
+        self.assertEqual(self._shown(), [0, 1, 2, 3, 4])
+        self.assertEqual([row['id'] for row in self.table.rows_list],
+                         [0, 1, 2, 3, 4])
+
+    def test_rows_inserted_while_sorted(self):
+        self.table.sort_by('price')
+        self.table.insert_rows(0, [{'id': 5, 'price': 1}])
+        self.assertEqual(self._shown(), [0, 2, 5, 1, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+""" Tests of the sources of rows fetched a page at a time, and of the
+store taking the pages from them in the background
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from paphra_tktable.source import (CsvSource, DataSource, PagedRowStore,
+                                   SqliteSource)
+
+_KEYS = ['id', 'name']
+
+
+class _ListSource(DataSource):
+    """ The rows of a list, failing for the pages asked for """
+
+    def __init__(self, count, failing=()):
+        self.rows = [{'id': _i, 'name': str(_i)} for _i in range(count)]
+        self.failing = set(failing)
+        self.asked = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get_range(self, start, stop):
+        self.asked.append(start)
+        if start in self.failing:
+            raise OSError('page at {} is gone'.format(start))
+        return self.rows[start:stop]
+
+
+def _wait(store):
+    """ Takes in the pages fetched until none is being fetched """
+    end = time.monotonic() + 5
+    while store.pending and time.monotonic() < end:
+        store.poll()
+        time.sleep(0.005)
+    store.poll()
+
+
+class CsvSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _source(self, text, **fmtparams):
+        path = os.path.join(self.folder.name, 'rows.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(text)
+        return CsvSource(path, **fmtparams)
+
+    def test_offsets_of_rows_over_lines(self):
+        source = self._source('id,name\r\n1,"a\r\nb"\r\n\r\n2,"say ""hi"""\r\n'
+                              '3,c')
+        self.assertEqual(len(source), 3)
+        self.assertEqual(source.get_range(1, 3),
+                         [{'id': '2', 'name': 'say "hi"'},
+                          {'id': '3', 'name': 'c'}])
+        self.assertEqual(source.get_range(0, 1),
+                         [{'id': '1', 'name': 'a\r\nb'}])
+        self.assertEqual(source.get_range(3, 9), [])
+
+    def test_header_over_lines(self):
+        source = self._source('id,"na\nme"\n1,x\n')
+        self.assertEqual(source.keys, ['id', 'na\nme'])
+        self.assertEqual(source.get_range(0, 1), [{'id': '1', 'na\nme': 'x'}])
+
+    def test_quote_character(self):
+        source = self._source("id;name\n1;'a;\nb'\n2;c\n", delimiter=';',
+                              quotechar="'")
+        self.assertEqual(len(source), 2)
+        self.assertEqual(source.get_range(0, 2)[0]['name'], 'a;\nb')
+
+
+class SqliteSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'rows.db')
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE logs (id INTEGER, name TEXT)')
+        conn.executemany('INSERT INTO logs VALUES (?, ?)',
+                         [(_i, 'n{:04d}'.format(999 - _i))
+                          for _i in range(1000)])
+        conn.execute('DELETE FROM logs WHERE id % 7 = 3')
+        conn.commit()
+        self.ids = [row[0] for row in
+                    conn.execute('SELECT id FROM logs ORDER BY rowid')]
+        conn.close()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_pages_in_the_order_of_the_rowid(self):
+        source = SqliteSource(self.path, 'logs', key='id')
+        self.assertEqual(len(source), len(self.ids))
+        for start in list(range(0, len(self.ids), 50)) + [777, 3, 400]:
+            self.assertEqual([row['id'] for row in
+                              source.get_range(start, start + 50)],
+                             self.ids[start:start + 50])
+        self.assertEqual(source.get_by_key(5), {'id': 5, 'name': 'n0994'})
+        self.assertIsNone(source.get_by_key(3))
+
+    def test_pages_in_another_order(self):
+        source = SqliteSource(self.path, 'logs', columns=['id'],
+                              order_by='name')
+        self.assertEqual(source.get_range(0, 2), [{'id': 999}, {'id': 998}])
+
+
+class PagedRowStoreTest(unittest.TestCase):
+
+    def test_pages_are_fetched_and_the_oldest_dropped(self):
+        source = _ListSource(100)
+        store = PagedRowStore(source, _KEYS, page_size=10, cache_pages=2)
+        self.addCleanup(store.close)
+        self.assertEqual(store.row(25)['id'], 'Loading...')
+        _wait(store)
+        self.assertEqual(store.row(25), {'id': 25, 'name': '25'})
+        store.row(55)
+        _wait(store)
+        self.assertEqual(sorted(store._pages), [5, 6])
+        self.assertEqual(store.fetch(3), {'id': 3, 'name': '3'})
+        self.assertEqual([row['id'] for row in store][-1], 99)
+
+    def test_a_failed_page_is_reported_once(self):
+        errors = []
+        source = _ListSource(100, failing=[20])
+        store = PagedRowStore(source, _KEYS, page_size=10,
+                              on_error=errors.append)
+        self.addCleanup(store.close)
+        store.row(25)
+        _wait(store)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], OSError)
+        self.assertEqual(store.row(25)['id'], 'Not loaded')
+        self.assertFalse(store.pending)
+        self.assertEqual(source.asked.count(20), 1)
+
+    def test_the_rows_cannot_be_changed(self):
+        store = PagedRowStore(_ListSource(5), _KEYS)
+        self.addCleanup(store.close)
+        self.assertFalse(store.writable)
+        with self.assertRaises(NotImplementedError):
+            store.insert(0, [{'id': 9, 'name': '9'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
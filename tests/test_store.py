@@ -0,0 +1,95 @@
+""" Tests of the stores of the rows, against a list of the same rows
+"""
+
+import random
+import unittest
+
+from paphra_tktable.store import ColumnarRowStore, DictRowStore
+
+_KEYS = ['id', 'qty', 'name']
+
+
+def _rows(start, count):
+    return [{'id': _i, 'qty': _i * 2, 'name': 'n' + str(_i)}
+            for _i in range(start, start + count)]
+
+
+class StoreTest(unittest.TestCase):
+
+    def _stores(self, rows):
+        return [DictRowStore(list(rows)),
+                ColumnarRowStore(_KEYS, rows),
+                ColumnarRowStore(_KEYS, rows, {'id': 'q', 'qty': 'q'})]
+
+    def _check(self, store, expected):
+        self.assertEqual(len(store), len(expected))
+        self.assertEqual(list(store), expected)
+        self.assertEqual(list(store.column('qty')),
+                         [row['qty'] for row in expected])
+        if expected:
+            self.assertEqual(store.value(len(expected) - 1, 'name'),
+                             expected[-1]['name'])
+
+    def test_against_a_list(self):
+        rand = random.Random(11)
+        for store in self._stores(_rows(0, 50)):
+            expected = _rows(0, 50)
+            made = 50
+            for _n in range(100):
+                kind = rand.choice(['insert', 'remove', 'replace'])
+                if kind == 'insert':
+                    at = rand.randrange(len(expected) + 1)
+                    new = _rows(made, rand.randrange(1, 5))
+                    made = made + len(new)
+                    store.insert(at, new)
+                    expected[at:at] = new
+                elif kind == 'remove' and expected:
+                    count = rand.choice([1, 3, 40])   # both ways of removing
+                    gone = sorted(rand.sample(range(len(expected)),
+                                              min(count, len(expected))))
+                    removed = store.remove(gone)
+                    self.assertEqual(removed, [expected[_i] for _i in gone])
+                    for _i in reversed(gone):
+                        del expected[_i]
+                elif expected:
+                    at = rand.randrange(len(expected))
+                    row = _rows(made, 1)[0]
+                    made = made + 1
+                    store.replace(at, row)
+                    expected[at] = row
+                self._check(store, expected)
+
+    def test_typed_columns_stay_arrays(self):
+        store = ColumnarRowStore(_KEYS, _rows(0, 40), {'qty': 'q'})
+        store.remove(list(range(0, 40, 2)))
+        self.assertEqual(store.column('qty').typecode, 'q')
+        self.assertEqual(list(store.column('qty')),
+                         [_i * 2 for _i in range(1, 40, 2)])
+
+    def test_values_not_fitting_the_array_go_to_a_list(self):
+        store = ColumnarRowStore(_KEYS, _rows(0, 3), {'id': 'q', 'qty': 'q'})
+        store.insert(3, [{'id': 3, 'qty': '', 'name': 'n3'}])
+        store.replace(0, {'id': 2 ** 70, 'qty': 0, 'name': 'n0'})
+        self.assertEqual(store.types, {})
+        self.assertEqual(store.column('qty'), [0, 2, 4, ''])
+        self.assertEqual(store.value(0, 'id'), 2 ** 70)
+
+    def test_rows_view(self):
+        rows = ColumnarRowStore(_KEYS, _rows(0, 5)).rows
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1]['id'], 4)
+        self.assertEqual([row['id'] for row in rows[1:4:2]], [1, 3])
+        with self.assertRaises(IndexError):
+            rows[5]
+
+    def test_dict_store_keeps_the_list(self):
+        rows = _rows(0, 3)
+        store = DictRowStore(rows)
+        store.insert(3, _rows(3, 1))
+        store.remove([0])
+        self.assertIs(store.rows, rows)
+        self.assertEqual([row['id'] for row in rows], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
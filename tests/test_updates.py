@@ -0,0 +1,163 @@
+""" Tests of the queue of the changes of the rows, and of the table
+taking them in. The tests of the table need a display and are skipped
+without one
+"""
+
+import asyncio
+import threading
+import tkinter as tk
+import unittest
+
+from paphra_tktable import table as tktable
+from paphra_tktable.updates import UpdateQueue
+
+_KEYS = ['id', 'name']
+_TITLES = [{'text': 'Id', 'width': 6, 'type': 'l'},
+           {'text': 'Name', 'width': 15, 'type': 'l'}]
+
+
+class UpdateQueueTest(unittest.TestCase):
+
+    def test_changes_of_a_row_are_merged(self):
+        queue = UpdateQueue('id')
+        queue.insert({'id': 1, 'name': 'a', 'note': ''})
+        queue.update({'id': 1, 'name': 'b'})
+        queue.update({'id': 2, 'name': 'c'})
+        queue.update({'id': 2, 'note': 'd'})
+        queue.delete(3)
+        queue.update({'id': 3, 'name': 'gone'})
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.drain(), [
+            (1, 'insert', {'id': 1, 'name': 'b', 'note': ''}),
+            (2, 'update', {'id': 2, 'name': 'c', 'note': 'd'}),
+            (3, 'delete', None)])
+        self.assertEqual(len(queue), 0)
+
+    def test_insert_and_delete_take_the_place_of_a_change(self):
+        queue = UpdateQueue('id')
+        queue.update({'id': 1, 'name': 'a'})
+        queue.delete(1)
+        queue.insert({'id': 2, 'name': 'b'})
+        queue.delete(2)
+        queue.insert({'id': 2, 'name': 'c'})
+        self.assertEqual(queue.drain(), [(1, 'delete', None),
+                                         (2, 'insert', {'id': 2,
+                                                        'name': 'c'})])
+
+    def test_the_row_posted_is_copied(self):
+        queue = UpdateQueue('id')
+        row = {'id': 1, 'name': 'a'}
+        queue.insert(row)
+        row['name'] = 'changed by the producer'
+        self.assertEqual(queue.drain()[0][2]['name'], 'a')
+
+    def test_drain_takes_the_oldest_first(self):
+        queue = UpdateQueue('id')
+        for _i in range(5):
+            queue.insert({'id': _i})
+        self.assertEqual([value for value, _kind, _row in queue.drain(2)],
+                         [0, 1])
+        self.assertEqual([value for value, _kind, _row in queue.drain()],
+                         [2, 3, 4])
+
+    def test_post_and_close(self):
+        queue = UpdateQueue('id')
+        queue.post('delete', 4)
+        with self.assertRaises(ValueError):
+            queue.post('upsert', {'id': 4})
+        queue.close()
+        with self.assertRaises(RuntimeError):
+            queue.insert({'id': 5})
+        self.assertEqual(queue.drain(), [(4, 'delete', None)])
+
+    def test_posts_from_threads(self):
+        queue = UpdateQueue('id')
+
+        def _produce(start):
+            for _i in range(start, start + 500):
+                queue.insert({'id': _i % 700, 'name': str(_i)})
+
+        threads = [threading.Thread(target=_produce, args=(_n * 500,))
+                   for _n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(queue.drain()), 700)
+
+    def test_feed_waits_for_room(self):
+        queue = UpdateQueue('id', max_pending=3)
+        drained = []
+
+        async def _changes():
+            for _i in range(10):
+                yield 'insert', {'id': _i}
+
+        async def _main():
+            feeding = asyncio.ensure_future(queue.feed(_changes()))
+            while not feeding.done():
+                await asyncio.sleep(0)
+                self.assertLessEqual(len(queue), 3)
+                drained.extend(queue.drain(1))
+            drained.extend(queue.drain())
+            return feeding.result()
+
+        self.assertEqual(asyncio.run(_main()), 10)
+        self.assertEqual([value for value, _kind, _row in drained],
+                         list(range(10)))
+
+
+class TableUpdatesTest(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest('no display')
+        self.root.withdraw()
+        self.errors = []
+        self.table = tktable.Table(self.root, list(_KEYS), _TITLES)
+        self.queue = self.table.updates('id', on_error=self.errors.append)
+
+    def tearDown(self):
+        self.table.stop_updates()
+        self.root.destroy()
+
+    def _ids(self):
+        return [row['id'] for row in self.table.rows_list]
+
+    def test_inserts_into_an_empty_table(self):
+        self.queue.insert({'id': 1, 'name': 'one'})
+        self.queue.insert({'id': 2, 'name': 'two'})
+        self.table._take_updates()
+        self.assertEqual(self.errors, [])
+        self.assertEqual(self._ids(), [1, 2])
+
+    def test_keeps_taking_in_after_a_bad_change(self):
+        self.queue.insert({'id': 1})
+        self.queue.insert({'id': 2, 'name': 'two'})
+        self.table._take_updates()
+        self.assertEqual(len(self.errors), 1)
+        self.assertIsInstance(self.errors[0], ValueError)
+        self.assertEqual(self._ids(), [2])
+        self.assertIsNotNone(self.table._updates_job)
+
+        self.queue.update({'id': 2, 'name': 'TWO'})
+        self.queue.insert({'id': 3, 'name': 'three'})
+        self.table._take_updates()
+        self.assertEqual(self._ids(), [2, 3])
+        self.assertEqual(self.table.rows_list[0]['name'], 'TWO')
+
+    def test_merged_changes_of_a_row(self):
+        self.table.add_rows([{'id': _i, 'name': str(_i)} for _i in range(5)])
+        for _n in range(10):
+            self.queue.update({'id': 1, 'name': 'n' + str(_n)})
+        self.queue.delete(3)
+        self.queue.update({'id': 9, 'name': 'not on the table'})
+        self.table._take_updates()
+        self.assertEqual(self._ids(), [0, 1, 2, 4])
+        self.assertEqual(self.table.rows_list[1]['name'], 'n9')
+
+
+if __name__ == '__main__':
+    unittest.main()